@@ -1,6 +1,7 @@
 """MELCloud client library."""
+import asyncio
 from datetime import timedelta
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 
 from aiohttp import ClientSession
 
@@ -20,8 +21,8 @@ async def login(
 
     Returns access token.
     """
-    _client = await _login(email, password, session,)
-    return _client.token
+    async with await _login(email, password, session,) as _client:
+        return _client.token
 
 
 async def get_devices(
@@ -48,20 +49,37 @@ async def get_devices(
         device_set_debounce=device_set_debounce,
     )
     await _client.update_confs()
+
+    ata_devices: List[Device] = []
+    atw_devices: List[Device] = []
+    erv_devices: List[Device] = []
+    for conf in _client.device_confs:
+        device_type = conf.get("Device", {}).get("DeviceType")
+        if device_type == 0:
+            ata_devices.append(
+                AtaDevice(conf, _client, set_debounce=device_set_debounce)
+            )
+        elif device_type == 1:
+            atw_devices.append(
+                AtwDevice(conf, _client, set_debounce=device_set_debounce)
+            )
+        elif device_type == 3:
+            erv_devices.append(
+                ErvDevice(conf, _client, set_debounce=device_set_debounce)
+            )
+
     return {
-        DEVICE_TYPE_ATA: [
-            AtaDevice(conf, _client, set_debounce=device_set_debounce)
-            for conf in _client.device_confs
-            if conf.get("Device", {}).get("DeviceType") == 0
-        ],
-        DEVICE_TYPE_ATW: [
-            AtwDevice(conf, _client, set_debounce=device_set_debounce)
-            for conf in _client.device_confs
-            if conf.get("Device", {}).get("DeviceType") == 1
-        ],
-        DEVICE_TYPE_ERV: [
-            ErvDevice(conf, _client, set_debounce=device_set_debounce)
-            for conf in _client.device_confs
-            if conf.get("Device", {}).get("DeviceType") == 3
-        ],
+        DEVICE_TYPE_ATA: ata_devices,
+        DEVICE_TYPE_ATW: atw_devices,
+        DEVICE_TYPE_ERV: erv_devices,
     }
+
+
+async def update_devices(devices: Iterable[Device]):
+    """Update the state of multiple devices concurrently.
+
+    Devices sharing a Client share a single device conf refresh and fetch their
+    states in parallel over the shared session. The same rate limiting
+    considerations as with Device.update apply.
+    """
+    await asyncio.gather(*(device.update() for device in devices))
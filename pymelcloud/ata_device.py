@@ -1,6 +1,7 @@
 """Air-To-Air (DeviceType=0) device definition."""
 from datetime import timedelta
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from pymelcloud.device import EFFECTIVE_FLAGS, Device
 from pymelcloud.client import Client
@@ -13,6 +14,14 @@ PROPERTY_VANE_VERTICAL = "vane_vertical"
 
 FAN_SPEED_AUTO = "auto"
 
+_FAN_SPEEDS = tuple(str(num) for num in range(1, 16))
+_FAN_SPEED_LOOKUP = MappingProxyType(
+    {0: FAN_SPEED_AUTO, **dict(enumerate(_FAN_SPEEDS, start=1))}
+)
+_REVERSE_FAN_SPEED_LOOKUP = MappingProxyType(
+    {value: key for key, value in _FAN_SPEED_LOOKUP.items()}
+)
+
 OPERATION_MODE_HEAT = "heat"
 OPERATION_MODE_DRY = "dry"
 OPERATION_MODE_COOL = "cool"
@@ -20,31 +29,40 @@ OPERATION_MODE_FAN_ONLY = "fan_only"
 OPERATION_MODE_HEAT_COOL = "heat_cool"
 OPERATION_MODE_UNDEFINED = "undefined"
 
-_OPERATION_MODE_LOOKUP = {
-    1: OPERATION_MODE_HEAT,
-    2: OPERATION_MODE_DRY,
-    3: OPERATION_MODE_COOL,
-    7: OPERATION_MODE_FAN_ONLY,
-    8: OPERATION_MODE_HEAT_COOL,
-}
-
-_OPERATION_MODE_MIN_TEMP_LOOKUP = {
-    OPERATION_MODE_HEAT: "MinTempHeat",
-    OPERATION_MODE_DRY: "MinTempCoolDry",
-    OPERATION_MODE_COOL: "MinTempCoolDry",
-    OPERATION_MODE_FAN_ONLY: "MinTempHeat",  # Fake it just in case.
-    OPERATION_MODE_HEAT_COOL: "MinTempAutomatic",
-    OPERATION_MODE_UNDEFINED: "MinTempHeat",
-}
-
-_OPERATION_MODE_MAX_TEMP_LOOKUP = {
-    OPERATION_MODE_HEAT: "MaxTempHeat",
-    OPERATION_MODE_DRY: "MaxTempCoolDry",
-    OPERATION_MODE_COOL: "MaxTempCoolDry",
-    OPERATION_MODE_FAN_ONLY: "MaxTempHeat",  # Fake it just in case.
-    OPERATION_MODE_HEAT_COOL: "MaxTempAutomatic",
-    OPERATION_MODE_UNDEFINED: "MaxTempHeat",
-}
+_OPERATION_MODE_LOOKUP = MappingProxyType(
+    {
+        1: OPERATION_MODE_HEAT,
+        2: OPERATION_MODE_DRY,
+        3: OPERATION_MODE_COOL,
+        7: OPERATION_MODE_FAN_ONLY,
+        8: OPERATION_MODE_HEAT_COOL,
+    }
+)
+_REVERSE_OPERATION_MODE_LOOKUP = MappingProxyType(
+    {value: key for key, value in _OPERATION_MODE_LOOKUP.items()}
+)
+
+_OPERATION_MODE_MIN_TEMP_LOOKUP = MappingProxyType(
+    {
+        OPERATION_MODE_HEAT: "MinTempHeat",
+        OPERATION_MODE_DRY: "MinTempCoolDry",
+        OPERATION_MODE_COOL: "MinTempCoolDry",
+        OPERATION_MODE_FAN_ONLY: "MinTempHeat",  # Fake it just in case.
+        OPERATION_MODE_HEAT_COOL: "MinTempAutomatic",
+        OPERATION_MODE_UNDEFINED: "MinTempHeat",
+    }
+)
+
+_OPERATION_MODE_MAX_TEMP_LOOKUP = MappingProxyType(
+    {
+        OPERATION_MODE_HEAT: "MaxTempHeat",
+        OPERATION_MODE_DRY: "MaxTempCoolDry",
+        OPERATION_MODE_COOL: "MaxTempCoolDry",
+        OPERATION_MODE_FAN_ONLY: "MaxTempHeat",  # Fake it just in case.
+        OPERATION_MODE_HEAT_COOL: "MaxTempAutomatic",
+        OPERATION_MODE_UNDEFINED: "MaxTempHeat",
+    }
+)
 
 V_VANE_POSITION_AUTO = "auto"
 V_VANE_POSITION_1 = "1_up"
@@ -68,15 +86,17 @@ H_VANE_POSITION_UNDEFINED = "undefined"
 
 
 def _fan_speed_from(speed: int) -> str:
-    if speed == 0:
-        return FAN_SPEED_AUTO
-    return str(speed)
+    try:
+        return _FAN_SPEED_LOOKUP[speed]
+    except KeyError:
+        return str(speed)
 
 
 def _fan_speed_to(speed: str) -> int:
-    if speed == FAN_SPEED_AUTO:
-        return 0
-    return int(speed)
+    try:
+        return _REVERSE_FAN_SPEED_LOOKUP[speed]
+    except KeyError:
+        return int(speed)
 
 
 def _operation_mode_from(mode: int) -> str:
@@ -84,22 +104,38 @@ def _operation_mode_from(mode: int) -> str:
 
 
 def _operation_mode_to(mode: str) -> int:
-    for k, value in _OPERATION_MODE_LOOKUP.items():
-        if value == mode:
-            return k
-    raise ValueError(f"Invalid operation_mode [{mode}]")
-
-
-_H_VANE_POSITION_LOOKUP = {
-    0: H_VANE_POSITION_AUTO,
-    1: H_VANE_POSITION_1,
-    2: H_VANE_POSITION_2,
-    3: H_VANE_POSITION_3,
-    4: H_VANE_POSITION_4,
-    5: H_VANE_POSITION_5,
-    8: H_VANE_POSITION_SPLIT,
-    12: H_VANE_POSITION_SWING,
-}
+    try:
+        return _REVERSE_OPERATION_MODE_LOOKUP[mode]
+    except KeyError:
+        raise ValueError(f"Invalid operation_mode [{mode}]") from None
+
+
+_H_VANE_POSITION_LOOKUP = MappingProxyType(
+    {
+        0: H_VANE_POSITION_AUTO,
+        1: H_VANE_POSITION_1,
+        2: H_VANE_POSITION_2,
+        3: H_VANE_POSITION_3,
+        4: H_VANE_POSITION_4,
+        5: H_VANE_POSITION_5,
+        8: H_VANE_POSITION_SPLIT,
+        12: H_VANE_POSITION_SWING,
+    }
+)
+_REVERSE_H_VANE_POSITION_LOOKUP = MappingProxyType(
+    {value: key for key, value in _H_VANE_POSITION_LOOKUP.items()}
+)
+
+_H_VANE_POSITIONS = (
+    H_VANE_POSITION_AUTO,  # ModelSupportsAuto could affect this.
+    H_VANE_POSITION_1,
+    H_VANE_POSITION_2,
+    H_VANE_POSITION_3,
+    H_VANE_POSITION_4,
+    H_VANE_POSITION_5,
+    H_VANE_POSITION_SPLIT,
+)
+_H_VANE_POSITIONS_WITH_SWING = _H_VANE_POSITIONS + (H_VANE_POSITION_SWING,)
 
 
 def _horizontal_vane_from(position: int) -> str:
@@ -107,21 +143,36 @@ def _horizontal_vane_from(position: int) -> str:
 
 
 def _horizontal_vane_to(position: str) -> int:
-    for k, value in _H_VANE_POSITION_LOOKUP.items():
-        if value == position:
-            return k
-    raise ValueError(f"Invalid horizontal vane position [{position}]")
-
-
-_V_VANE_POSITION_LOOKUP = {
-    0: V_VANE_POSITION_AUTO,
-    1: V_VANE_POSITION_1,
-    2: V_VANE_POSITION_2,
-    3: V_VANE_POSITION_3,
-    4: V_VANE_POSITION_4,
-    5: V_VANE_POSITION_5,
-    7: V_VANE_POSITION_SWING,
-}
+    try:
+        return _REVERSE_H_VANE_POSITION_LOOKUP[position]
+    except KeyError:
+        raise ValueError(f"Invalid horizontal vane position [{position}]") from None
+
+
+_V_VANE_POSITION_LOOKUP = MappingProxyType(
+    {
+        0: V_VANE_POSITION_AUTO,
+        1: V_VANE_POSITION_1,
+        2: V_VANE_POSITION_2,
+        3: V_VANE_POSITION_3,
+        4: V_VANE_POSITION_4,
+        5: V_VANE_POSITION_5,
+        7: V_VANE_POSITION_SWING,
+    }
+)
+_REVERSE_V_VANE_POSITION_LOOKUP = MappingProxyType(
+    {value: key for key, value in _V_VANE_POSITION_LOOKUP.items()}
+)
+
+_V_VANE_POSITIONS = (
+    V_VANE_POSITION_AUTO,  # ModelSupportsAuto could affect this.
+    V_VANE_POSITION_1,
+    V_VANE_POSITION_2,
+    V_VANE_POSITION_3,
+    V_VANE_POSITION_4,
+    V_VANE_POSITION_5,
+)
+_V_VANE_POSITIONS_WITH_SWING = _V_VANE_POSITIONS + (V_VANE_POSITION_SWING,)
 
 
 def _vertical_vane_from(position: int) -> str:
@@ -129,15 +180,46 @@ def _vertical_vane_from(position: int) -> str:
 
 
 def _vertical_vane_to(position: str) -> int:
-    for k, value in _V_VANE_POSITION_LOOKUP.items():
-        if value == position:
-            return k
-    raise ValueError(f"Invalid vertical vane position [{position}]")
+    try:
+        return _REVERSE_V_VANE_POSITION_LOOKUP[position]
+    except KeyError:
+        raise ValueError(f"Invalid vertical vane position [{position}]") from None
+
+
+_PropertyWrite = Tuple[str, Callable[[Any, Any], Any], int]
+
+_PROPERTY_WRITES: Mapping[str, _PropertyWrite] = MappingProxyType(
+    {
+        PROPERTY_TARGET_TEMPERATURE: ("SetTemperature", Device.round_temperature, 0x04),
+        PROPERTY_OPERATION_MODE: (
+            "OperationMode",
+            lambda _, value: _operation_mode_to(value),
+            0x02,
+        ),
+        PROPERTY_FAN_SPEED: (
+            "SetFanSpeed",
+            lambda _, value: _fan_speed_to(value),
+            0x08,
+        ),
+        PROPERTY_VANE_HORIZONTAL: (
+            "VaneHorizontal",
+            lambda _, value: _horizontal_vane_to(value),
+            0x100,
+        ),
+        PROPERTY_VANE_VERTICAL: (
+            "VaneVertical",
+            lambda _, value: _vertical_vane_to(value),
+            0x10,
+        ),
+    }
+)
 
 
 class AtaDevice(Device):
     """Air-to-Air device."""
 
+    __slots__ = ("last_energy_value", "_operation_modes")
+
     def __init__(
         self,
         device_conf: Dict[str, Any],
@@ -148,37 +230,43 @@ class AtaDevice(Device):
         super().__init__(device_conf, client, set_debounce)
         self.last_energy_value = None
 
+    def _update_device_conf(self, device_conf: Dict[str, Any]):
+        super()._update_device_conf(device_conf)
+        conf_dev = self._conf_dev
+        modes: List[str] = []
+        if conf_dev.get("CanHeat", False):
+            modes.append(OPERATION_MODE_HEAT)
+
+        if conf_dev.get("CanDry", False):
+            modes.append(OPERATION_MODE_DRY)
+
+        if conf_dev.get("CanCool", False):
+            modes.append(OPERATION_MODE_COOL)
+
+        modes.append(OPERATION_MODE_FAN_ONLY)
+
+        if conf_dev.get("ModelSupportsAuto", False):
+            modes.append(OPERATION_MODE_HEAT_COOL)
+
+        self._operation_modes = tuple(modes)
+
     def apply_write(self, state: Dict[str, Any], key: str, value: Any):
         """Apply writes to state object.
 
         Used for property validation, do not modify device state.
         """
-        flags = state.get(EFFECTIVE_FLAGS, 0)
-
-        if key == PROPERTY_TARGET_TEMPERATURE:
-            state["SetTemperature"] = self.round_temperature(value)
-            flags = flags | 0x04
-        elif key == PROPERTY_OPERATION_MODE:
-            state["OperationMode"] = _operation_mode_to(value)
-            flags = flags | 0x02
-        elif key == PROPERTY_FAN_SPEED:
-            state["SetFanSpeed"] = _fan_speed_to(value)
-            flags = flags | 0x08
-        elif key == PROPERTY_VANE_HORIZONTAL:
-            state["VaneHorizontal"] = _horizontal_vane_to(value)
-            flags = flags | 0x100
-        elif key == PROPERTY_VANE_VERTICAL:
-            state["VaneVertical"] = _vertical_vane_to(value)
-            flags = flags | 0x10
-        else:
-            raise ValueError(f"Cannot set {key}, invalid property")
-
-        state[EFFECTIVE_FLAGS] = flags
+        try:
+            state_key, convert, flag = _PROPERTY_WRITES[key]
+        except KeyError:
+            raise ValueError(f"Cannot set {key}, invalid property") from None
+
+        state[state_key] = convert(self, value)
+        state[EFFECTIVE_FLAGS] = state.get(EFFECTIVE_FLAGS, 0) | flag
 
     @property
     def has_energy_consumed_meter(self) -> bool:
         """Return True if the device has an energy consumption meter."""
-        return self._device_conf.get("Device", {}).get("HasEnergyConsumedMeter", False)
+        return self._conf_dev.get("HasEnergyConsumedMeter", False)
 
     @property
     def total_energy_consumed(self) -> Optional[float]:
@@ -187,32 +275,32 @@ class AtaDevice(Device):
         The update interval is extremely slow and inconsistent. Empirical evidence
         suggests that it can vary between 1h 30min and 3h.
         """
-        if self._device_conf is None:
-            return None
-        device = self._device_conf.get("Device", {})
-        value = device.get("CurrentEnergyConsumed", None)
+        value = self._conf_dev.get("CurrentEnergyConsumed")
         if value is None:
             return None
 
         if value == 0.0:
             return self.last_energy_value
 
-        self.last_energy_value = value / 1000.0
-        return self.last_energy_value
+        energy = value / 1000.0
+        self.last_energy_value = energy
+        return energy
 
     @property
     def room_temperature(self) -> Optional[float]:
         """Return room temperature reported by the device."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("RoomTemperature")
+        return state.get("RoomTemperature")
 
     @property
     def target_temperature(self) -> Optional[float]:
         """Return target temperature set for the device."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("SetTemperature")
+        return state.get("SetTemperature")
 
     @property
     def target_temperature_step(self) -> float:
@@ -224,47 +312,29 @@ class AtaDevice(Device):
         """Return maximum target temperature for the currently active operation mode."""
         if self._state is None:
             return None
-        return self._device_conf.get("Device", {}).get(
-            _OPERATION_MODE_MIN_TEMP_LOOKUP.get(self.operation_mode), 10
-        )
+        min_temp_key = _OPERATION_MODE_MIN_TEMP_LOOKUP.get(self.operation_mode)
+        return self._conf_dev.get(min_temp_key, 10)
 
     @property
     def target_temperature_max(self) -> Optional[float]:
         """Return maximum target temperature for the currently active operation mode."""
         if self._state is None:
             return None
-        return self._device_conf.get("Device", {}).get(
-            _OPERATION_MODE_MAX_TEMP_LOOKUP.get(self.operation_mode), 31
-        )
+        max_temp_key = _OPERATION_MODE_MAX_TEMP_LOOKUP.get(self.operation_mode)
+        return self._conf_dev.get(max_temp_key, 31)
 
     @property
     def operation_mode(self) -> str:
         """Return currently active operation mode."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return OPERATION_MODE_UNDEFINED
-        return _operation_mode_from(self._state.get("OperationMode", -1))
+        return _operation_mode_from(state.get("OperationMode", -1))
 
     @property
     def operation_modes(self) -> List[str]:
         """Return available operation modes."""
-        modes: List[str] = []
-
-        conf_dev = self._device_conf.get("Device", {})
-        if conf_dev.get("CanHeat", False):
-            modes.append(OPERATION_MODE_HEAT)
-
-        if conf_dev.get("CanDry", False):
-            modes.append(OPERATION_MODE_DRY)
-
-        if conf_dev.get("CanCool", False):
-            modes.append(OPERATION_MODE_COOL)
-
-        modes.append(OPERATION_MODE_FAN_ONLY)
-
-        if conf_dev.get("ModelSupportsAuto", False):
-            modes.append(OPERATION_MODE_HEAT_COOL)
-
-        return modes
+        return list(self._operation_modes)
 
     @property
     def fan_speed(self) -> Optional[str]:
@@ -272,9 +342,10 @@ class AtaDevice(Device):
 
         The argument must be on of the fan speeds returned by fan_speeds.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return _fan_speed_from(self._state.get("SetFanSpeed"))
+        return _fan_speed_from(state.get("SetFanSpeed"))
 
     @property
     def fan_speeds(self) -> Optional[List[str]]:
@@ -296,14 +367,16 @@ class AtaDevice(Device):
         MELCloud is not aware of the device type making it infeasible to match the
         fan speed names with the device documentation.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
         speeds = []
-        if self._device_conf.get("Device", {}).get("HasAutomaticFanSpeed", False):
+        if self._conf_dev.get("HasAutomaticFanSpeed", False):
             speeds.append(FAN_SPEED_AUTO)
 
-        num_fan_speeds = self._state.get("NumberOfFanSpeeds", 0)
-        for num in range(1, num_fan_speeds + 1):
+        num_fan_speeds = max(state.get("NumberOfFanSpeeds", 0), 0)
+        speeds.extend(_FAN_SPEEDS[:num_fan_speeds])
+        for num in range(len(_FAN_SPEEDS) + 1, num_fan_speeds + 1):
             speeds.append(_fan_speed_from(num))
 
         return speeds
@@ -311,61 +384,44 @@ class AtaDevice(Device):
     @property
     def vane_horizontal(self) -> Optional[str]:
         """Return horizontal vane position."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return _horizontal_vane_from(self._state.get("VaneHorizontal"))
+        return _horizontal_vane_from(state.get("VaneHorizontal"))
 
     @property
     def vane_horizontal_positions(self) -> Optional[List[str]]:
         """Return available horizontal vane positions."""
         if self._device_conf.get("HideVaneControls", False):
             return []
-        device = self._device_conf.get("Device", {})
+        device = self._conf_dev
         if not device.get("ModelSupportsVaneHorizontal", False):
             return []
 
-        positions = [
-            H_VANE_POSITION_AUTO,  # ModelSupportsAuto could affect this.
-            H_VANE_POSITION_1,
-            H_VANE_POSITION_2,
-            H_VANE_POSITION_3,
-            H_VANE_POSITION_4,
-            H_VANE_POSITION_5,
-            H_VANE_POSITION_SPLIT,
-        ]
         if device.get("SwingFunction", False):
-            positions.append(H_VANE_POSITION_SWING)
-
-        return positions
+            return list(_H_VANE_POSITIONS_WITH_SWING)
+        return list(_H_VANE_POSITIONS)
 
     @property
     def vane_vertical(self) -> Optional[str]:
         """Return vertical vane position."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return _vertical_vane_from(self._state.get("VaneVertical"))
+        return _vertical_vane_from(state.get("VaneVertical"))
 
     @property
     def vane_vertical_positions(self) -> Optional[List[str]]:
         """Return available vertical vane positions."""
         if self._device_conf.get("HideVaneControls", False):
             return []
-        device = self._device_conf.get("Device", {})
+        device = self._conf_dev
         if not device.get("ModelSupportsVaneVertical", False):
             return []
 
-        positions = [
-            V_VANE_POSITION_AUTO,  # ModelSupportsAuto could affect this.
-            V_VANE_POSITION_1,
-            V_VANE_POSITION_2,
-            V_VANE_POSITION_3,
-            V_VANE_POSITION_4,
-            V_VANE_POSITION_5,
-        ]
         if device.get("SwingFunction", False):
-            positions.append(V_VANE_POSITION_SWING)
-
-        return positions
+            return list(_V_VANE_POSITIONS_WITH_SWING)
+        return list(_V_VANE_POSITIONS)
 
     @property
     def actual_fan_speed(self) -> Optional[str]:
@@ -376,4 +432,4 @@ class AtaDevice(Device):
         """
         if self._state is None:
             return None
-        return str(self._device_conf.get("Device", {}).get("ActualFanSpeed", -1))
+        return str(self._conf_dev.get("ActualFanSpeed", -1))
@@ -1,6 +1,9 @@
 """Air-To-Water (DeviceType=1) device definition."""
-from typing import Any, Callable, Dict, List, Optional
+from datetime import timedelta
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
+from pymelcloud.client import Client
 from pymelcloud.device import EFFECTIVE_FLAGS, Device
 
 PROPERTY_TARGET_TANK_TEMPERATURE = "target_tank_temperature"
@@ -17,6 +20,8 @@ PROPERTY_ZONE_2_OPERATION_MODE = "zone_2_operation_mode"
 OPERATION_MODE_AUTO = "auto"
 OPERATION_MODE_FORCE_HOT_WATER = "force_hot_water"
 
+_OPERATION_MODES = (OPERATION_MODE_AUTO, OPERATION_MODE_FORCE_HOT_WATER)
+
 STATUS_IDLE = "idle"
 STATUS_HEAT_WATER = "heat_water"
 STATUS_HEAT_ZONES = "heat_zones"
@@ -26,15 +31,17 @@ STATUS_STANDBY = "standby"
 STATUS_LEGIONELLA = "legionella"
 STATUS_UNKNOWN = "unknown"
 
-_STATE_LOOKUP = {
-    0: STATUS_IDLE,
-    1: STATUS_HEAT_WATER,
-    2: STATUS_HEAT_ZONES,
-    3: STATUS_COOL,
-    4: STATUS_DEFROST,
-    5: STATUS_STANDBY,
-    6: STATUS_LEGIONELLA,
-}
+_STATE_LOOKUP = MappingProxyType(
+    {
+        0: STATUS_IDLE,
+        1: STATUS_HEAT_WATER,
+        2: STATUS_HEAT_ZONES,
+        3: STATUS_COOL,
+        4: STATUS_DEFROST,
+        5: STATUS_STANDBY,
+        6: STATUS_LEGIONELLA,
+    }
+)
 
 
 _ZONE_INT_MODE_HEAT_THERMOSTAT = 0
@@ -49,16 +56,35 @@ ZONE_OPERATION_MODE_HEAT_FLOW = "heat-flow"
 ZONE_OPERATION_MODE_COOL_FLOW = "cool-flow"
 ZONE_OPERATION_MODE_CURVE = "curve"
 ZONE_OPERATION_MODE_UNKNOWN = "unknown"
-_ZONE_OPERATION_MODE_LOOKUP = {
-    _ZONE_INT_MODE_HEAT_THERMOSTAT: ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-    _ZONE_INT_MODE_HEAT_FLOW: ZONE_OPERATION_MODE_HEAT_FLOW,
-    _ZONE_INT_MODE_CURVE: ZONE_OPERATION_MODE_CURVE,
-    _ZONE_INT_MODE_COOL_THERMOSTAT: ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-    _ZONE_INT_MODE_COOL_FLOW: ZONE_OPERATION_MODE_COOL_FLOW,
-}
-_REVERSE_ZONE_OPERATION_MODE_LOOKUP = {
-    value: key for key, value in _ZONE_OPERATION_MODE_LOOKUP.items()
-}
+_ZONE_OPERATION_MODE_LOOKUP = MappingProxyType(
+    {
+        _ZONE_INT_MODE_HEAT_THERMOSTAT: ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
+        _ZONE_INT_MODE_HEAT_FLOW: ZONE_OPERATION_MODE_HEAT_FLOW,
+        _ZONE_INT_MODE_CURVE: ZONE_OPERATION_MODE_CURVE,
+        _ZONE_INT_MODE_COOL_THERMOSTAT: ZONE_OPERATION_MODE_COOL_THERMOSTAT,
+        _ZONE_INT_MODE_COOL_FLOW: ZONE_OPERATION_MODE_COOL_FLOW,
+    }
+)
+_REVERSE_ZONE_OPERATION_MODE_LOOKUP = MappingProxyType(
+    {value: key for key, value in _ZONE_OPERATION_MODE_LOOKUP.items()}
+)
+
+_ZONE_HEAT_OPERATION_MODES = (
+    ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
+    ZONE_OPERATION_MODE_HEAT_FLOW,
+    ZONE_OPERATION_MODE_CURVE,
+)
+_ZONE_COOL_OPERATION_MODES = (
+    ZONE_OPERATION_MODE_COOL_THERMOSTAT,
+    ZONE_OPERATION_MODE_COOL_FLOW,
+)
+_ZONE_COOLING_MODES = frozenset(_ZONE_COOL_OPERATION_MODES)
+_ZONE_INT_HEATING_MODES = frozenset(
+    {_ZONE_INT_MODE_HEAT_THERMOSTAT, _ZONE_INT_MODE_HEAT_FLOW, _ZONE_INT_MODE_CURVE}
+)
+_ZONE_INT_COOLING_MODES = frozenset(
+    {_ZONE_INT_MODE_COOL_THERMOSTAT, _ZONE_INT_MODE_COOL_FLOW}
+)
 
 ZONE_STATUS_HEAT = "heat"
 ZONE_STATUS_IDLE = "idle"
@@ -69,19 +95,64 @@ ZONE_STATUS_UNKNOWN = "unknown"
 class Zone:
     """Zone controlled by Air-to-Water device."""
 
+    __slots__ = (
+        "_device",
+        "_device_state",
+        "_device_conf",
+        "_device_zone_operation_modes",
+        "zone_index",
+        "_name_key",
+        "_default_name",
+        "_prohibit_key",
+        "_idle_key",
+        "_room_temperature_key",
+        "_target_temperature_key",
+        "_heat_flow_key",
+        "_cool_flow_key",
+        "_operation_mode_key",
+        "_target_temperature_prop",
+        "_heat_flow_prop",
+        "_cool_flow_prop",
+        "_operation_mode_prop",
+    )
+
     def __init__(
         self,
-        device,
+        device: "AtwDevice",
+        zone_index: int,
+        *,
         device_state: Callable[[], Optional[Dict[Any, Any]]],
         device_conf: Callable[[], Dict[Any, Any]],
-        zone_index: int,
+        zone_operation_modes: Callable[[], Tuple[str, ...]],
     ):
         """Initialize Zone."""
         self._device = device
         self._device_state = device_state
         self._device_conf = device_conf
+        self._device_zone_operation_modes = zone_operation_modes
         self.zone_index = zone_index
 
+        self._name_key = f"Zone{zone_index}Name"
+        self._default_name = f"Zone {zone_index}"
+        self._prohibit_key = f"ProhibitZone{zone_index}"
+        self._idle_key = f"IdleZone{zone_index}"
+        self._room_temperature_key = f"RoomTemperatureZone{zone_index}"
+        self._target_temperature_key = f"SetTemperatureZone{zone_index}"
+        self._heat_flow_key = f"SetHeatFlowTemperatureZone{zone_index}"
+        self._cool_flow_key = f"SetCoolFlowTemperatureZone{zone_index}"
+        self._operation_mode_key = f"OperationModeZone{zone_index}"
+
+        if zone_index == 1:
+            self._target_temperature_prop = PROPERTY_ZONE_1_TARGET_TEMPERATURE
+            self._heat_flow_prop = PROPERTY_ZONE_1_TARGET_HEAT_FLOW_TEMPERATURE
+            self._cool_flow_prop = PROPERTY_ZONE_1_TARGET_COOL_FLOW_TEMPERATURE
+            self._operation_mode_prop = PROPERTY_ZONE_1_OPERATION_MODE
+        else:
+            self._target_temperature_prop = PROPERTY_ZONE_2_TARGET_TEMPERATURE
+            self._heat_flow_prop = PROPERTY_ZONE_2_TARGET_HEAT_FLOW_TEMPERATURE
+            self._cool_flow_prop = PROPERTY_ZONE_2_TARGET_COOL_FLOW_TEMPERATURE
+            self._operation_mode_prop = PROPERTY_ZONE_2_OPERATION_MODE
+
     @property
     def name(self) -> Optional[str]:
         """Return zone name.
@@ -89,9 +160,9 @@ class Zone:
         If a name is not defined, a name is generated using format "Zone n" where "n"
         is the number of the zone.
         """
-        zone_name = self._device_conf().get(f"Zone{self.zone_index}Name")
+        zone_name = self._device_conf().get(self._name_key)
         if zone_name is None:
-            return f"Zone {self.zone_index}"
+            return self._default_name
         return zone_name
 
     @property
@@ -100,7 +171,7 @@ class Zone:
         state = self._device_state()
         if state is None:
             return None
-        return state.get(f"ProhibitZone{self.zone_index}")
+        return state.get(self._prohibit_key)
 
     @property
     def status(self) -> str:
@@ -112,20 +183,13 @@ class Zone:
         state = self._device_state()
         if state is None:
             return ZONE_STATUS_UNKNOWN
-        if state.get(f"IdleZone{self.zone_index}", False):
+        if state.get(self._idle_key, False):
             return ZONE_STATUS_IDLE
 
-        op_mode = self.operation_mode
-        if op_mode in [
-            ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-            ZONE_OPERATION_MODE_HEAT_FLOW,
-            ZONE_OPERATION_MODE_CURVE,
-        ]:
+        mode = state.get(self._operation_mode_key)
+        if mode in _ZONE_INT_HEATING_MODES:
             return ZONE_STATUS_HEAT
-        if op_mode in [
-            ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-            ZONE_OPERATION_MODE_COOL_FLOW,
-        ]:
+        if mode in _ZONE_INT_COOLING_MODES:
             return ZONE_STATUS_COOL
 
         return ZONE_STATUS_UNKNOWN
@@ -136,7 +200,7 @@ class Zone:
         state = self._device_state()
         if state is None:
             return None
-        return state.get(f"RoomTemperatureZone{self.zone_index}")
+        return state.get(self._room_temperature_key)
 
     @property
     def target_temperature(self) -> Optional[float]:
@@ -144,48 +208,41 @@ class Zone:
         state = self._device_state()
         if state is None:
             return None
-        return state.get(f"SetTemperatureZone{self.zone_index}")
+        return state.get(self._target_temperature_key)
 
     async def set_target_temperature(self, target_temperature):
         """Set target temperature for this zone."""
-        if self.zone_index == 1:
-            prop = PROPERTY_ZONE_1_TARGET_TEMPERATURE
-        else:
-            prop = PROPERTY_ZONE_2_TARGET_TEMPERATURE
-        await self._device.set({prop: target_temperature})
+        await self._device.set({self._target_temperature_prop: target_temperature})
 
     @property
-    def flow_temperature(self) -> float:
+    def flow_temperature(self) -> Optional[float]:
         """Return current flow temperature.
 
         This value is not available in the standard state poll response. The poll
         update frequency can be a little bit lower that expected.
         """
-        return self._device_conf()["Device"]["FlowTemperature"]
+        return self._device.get_device_prop("FlowTemperature")
 
     @property
-    def return_temperature(self) -> float:
+    def return_temperature(self) -> Optional[float]:
         """Return current return flow temperature.
 
         This value is not available in the standard state poll response. The poll
         update frequency can be a little bit lower that expected.
         """
-        return self._device_conf()["Device"]["ReturnTemperature"]
+        return self._device.get_device_prop("ReturnTemperature")
 
     @property
     def target_flow_temperature(self) -> Optional[float]:
         """Return target flow temperature of the currently active operation mode."""
-        op_mode = self.operation_mode
-        if op_mode is None:
+        state = self._device_state()
+        if state is None:
             return None
 
-        if op_mode in [
-            ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-            ZONE_OPERATION_MODE_COOL_FLOW,
-        ]:
-            return self.target_cool_flow_temperature
+        if state.get(self._operation_mode_key) in _ZONE_INT_COOLING_MODES:
+            return state.get(self._cool_flow_key)
 
-        return self.target_heat_flow_temperature
+        return state.get(self._heat_flow_key)
 
     @property
     def target_heat_flow_temperature(self) -> Optional[float]:
@@ -194,7 +251,7 @@ class Zone:
         if state is None:
             return None
 
-        return state.get(f"SetHeatFlowTemperatureZone{self.zone_index}")
+        return state.get(self._heat_flow_key)
 
     @property
     def target_cool_flow_temperature(self) -> Optional[float]:
@@ -203,7 +260,7 @@ class Zone:
         if state is None:
             return None
 
-        return state.get(f"SetCoolFlowTemperatureZone{self.zone_index}")
+        return state.get(self._cool_flow_key)
 
     async def set_target_flow_temperature(self, target_flow_temperature):
         """Set target flow temperature for the currently active operation mode."""
@@ -211,29 +268,18 @@ class Zone:
         if op_mode is None:
             return None
 
-        if op_mode in [
-            ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-            ZONE_OPERATION_MODE_COOL_FLOW,
-        ]:
+        if op_mode in _ZONE_COOLING_MODES:
             await self.set_target_cool_flow_temperature(target_flow_temperature)
         else:
             await self.set_target_heat_flow_temperature(target_flow_temperature)
 
     async def set_target_heat_flow_temperature(self, target_flow_temperature):
         """Set target heat flow temperature of this zone."""
-        if self.zone_index == 1:
-            prop = PROPERTY_ZONE_1_TARGET_HEAT_FLOW_TEMPERATURE
-        else:
-            prop = PROPERTY_ZONE_2_TARGET_HEAT_FLOW_TEMPERATURE
-        await self._device.set({prop: target_flow_temperature})
+        await self._device.set({self._heat_flow_prop: target_flow_temperature})
 
     async def set_target_cool_flow_temperature(self, target_flow_temperature):
         """Set target cool flow temperature of this zone."""
-        if self.zone_index == 1:
-            prop = PROPERTY_ZONE_1_TARGET_COOL_FLOW_TEMPERATURE
-        else:
-            prop = PROPERTY_ZONE_2_TARGET_COOL_FLOW_TEMPERATURE
-        await self._device.set({prop: target_flow_temperature})
+        await self._device.set({self._cool_flow_prop: target_flow_temperature})
 
     @property
     def operation_mode(self) -> Optional[str]:
@@ -242,34 +288,16 @@ class Zone:
         if state is None:
             return None
 
-        print(state)
-
-        mode = state.get(f"OperationModeZone{self.zone_index}")
+        mode = state.get(self._operation_mode_key)
         if not isinstance(mode, int):
             raise ValueError(f"Invalid operation mode [{mode}]")
 
-        return _ZONE_OPERATION_MODE_LOOKUP.get(
-            mode,
-            ZONE_OPERATION_MODE_UNKNOWN,
-        )
+        return _ZONE_OPERATION_MODE_LOOKUP.get(mode, ZONE_OPERATION_MODE_UNKNOWN)
 
     @property
     def operation_modes(self) -> List[str]:
         """Return list of available operation modes."""
-        modes = []
-        device = self._device_conf().get("Device", {})
-        if device.get("CanHeat", False):
-            modes += [
-                ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-                ZONE_OPERATION_MODE_HEAT_FLOW,
-                ZONE_OPERATION_MODE_CURVE,
-            ]
-        if device.get("CanCool", False):
-            modes += [
-                ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-                ZONE_OPERATION_MODE_COOL_FLOW,
-            ]
-        return modes
+        return list(self._device_zone_operation_modes())
 
     async def set_operation_mode(self, mode: str):
         """Change operation mode."""
@@ -277,59 +305,138 @@ class Zone:
         if state is None:
             return
 
-        int_mode = _REVERSE_ZONE_OPERATION_MODE_LOOKUP.get(mode)
-        if int_mode is None:
-            raise ValueError(f"Invalid mode '{mode}'")
-
-        if self.zone_index == 1:
-            prop = PROPERTY_ZONE_1_OPERATION_MODE
-        else:
-            prop = PROPERTY_ZONE_2_OPERATION_MODE
-
-        await self._device.set({prop: int_mode})
+        try:
+            int_mode = _REVERSE_ZONE_OPERATION_MODE_LOOKUP[mode]
+        except KeyError:
+            raise ValueError(f"Invalid mode '{mode}'") from None
+
+        await self._device.set({self._operation_mode_prop: int_mode})
+
+
+_PropertyWrite = Tuple[str, Callable[[Any, Any], Any], int]
+
+_PROPERTY_WRITES: Mapping[str, _PropertyWrite] = MappingProxyType(
+    {
+        PROPERTY_TARGET_TANK_TEMPERATURE: (
+            "SetTankWaterTemperature",
+            Device.round_temperature,
+            0x1000000000020,
+        ),
+        PROPERTY_OPERATION_MODE: (
+            "ForcedHotWaterMode",
+            lambda _, value: value == OPERATION_MODE_FORCE_HOT_WATER,
+            0x10000,
+        ),
+        PROPERTY_ZONE_1_TARGET_TEMPERATURE: (
+            "SetTemperatureZone1",
+            Device.round_temperature,
+            0x200000080,
+        ),
+        PROPERTY_ZONE_2_TARGET_TEMPERATURE: (
+            "SetTemperatureZone2",
+            Device.round_temperature,
+            0x800000200,
+        ),
+        PROPERTY_ZONE_1_TARGET_HEAT_FLOW_TEMPERATURE: (
+            "SetHeatFlowTemperatureZone1",
+            Device.round_temperature,
+            0x1000000000000,
+        ),
+        PROPERTY_ZONE_1_TARGET_COOL_FLOW_TEMPERATURE: (
+            "SetCoolFlowTemperatureZone1",
+            Device.round_temperature,
+            0x1000000000000,
+        ),
+        PROPERTY_ZONE_2_TARGET_HEAT_FLOW_TEMPERATURE: (
+            "SetHeatFlowTemperatureZone2",
+            Device.round_temperature,
+            0x1000000000000,
+        ),
+        PROPERTY_ZONE_2_TARGET_COOL_FLOW_TEMPERATURE: (
+            "SetCoolFlowTemperatureZone2",
+            Device.round_temperature,
+            0x1000000000000,
+        ),
+        PROPERTY_ZONE_1_OPERATION_MODE: (
+            "OperationModeZone1",
+            lambda _, value: value,
+            0x08,
+        ),
+        PROPERTY_ZONE_2_OPERATION_MODE: (
+            "OperationModeZone2",
+            lambda _, value: value,
+            0x10,
+        ),
+    }
+)
 
 
 class AtwDevice(Device):
     """Air-to-Water device."""
 
+    __slots__ = ("_zones", "_zones_key", "_zone_operation_modes")
+
+    def __init__(
+        self,
+        device_conf: Dict[str, Any],
+        client: Client,
+        set_debounce=timedelta(seconds=1),
+    ):
+        """Initialize an ATW device."""
+        self._zones: List[Zone] = []
+        self._zones_key: Optional[Tuple[bool, bool]] = None
+        super().__init__(device_conf, client, set_debounce)
+
+    def _update_device_conf(self, device_conf: Dict[str, Any]):
+        super()._update_device_conf(device_conf)
+        conf_dev = self._conf_dev
+        modes: Tuple[str, ...] = ()
+        if conf_dev.get("CanHeat"):
+            modes += _ZONE_HEAT_OPERATION_MODES
+        if conf_dev.get("CanCool"):
+            modes += _ZONE_COOL_OPERATION_MODES
+        self._zone_operation_modes = modes
+
+        zones_key = (
+            bool(conf_dev.get("HasThermostatZone1", False)),
+            bool(
+                conf_dev.get("HasZone2") and conf_dev.get("HasThermostatZone2", False)
+            ),
+        )
+        if zones_key != self._zones_key:
+            zones = []
+            for zone_index, has_zone in enumerate(zones_key, start=1):
+                if has_zone:
+                    zones.append(
+                        Zone(
+                            self,
+                            zone_index,
+                            device_state=self._get_state,
+                            device_conf=self._get_device_conf,
+                            zone_operation_modes=self._get_zone_operation_modes,
+                        )
+                    )
+            self._zones = zones
+            self._zones_key = zones_key
+
+    def _get_state(self) -> Optional[Dict[Any, Any]]:
+        return self._state
+
+    def _get_device_conf(self) -> Dict[Any, Any]:
+        return self._device_conf
+
+    def _get_zone_operation_modes(self) -> Tuple[str, ...]:
+        return self._zone_operation_modes
+
     def apply_write(self, state: Dict[str, Any], key: str, value: Any):
         """Apply writes to state object."""
-        flags = state.get(EFFECTIVE_FLAGS, 0)
-
-        if key == PROPERTY_TARGET_TANK_TEMPERATURE:
-            state["SetTankWaterTemperature"] = self.round_temperature(value)
-            flags |= 0x1000000000020
-        elif key == PROPERTY_OPERATION_MODE:
-            state["ForcedHotWaterMode"] = value == OPERATION_MODE_FORCE_HOT_WATER
-            flags |= 0x10000
-        elif key == PROPERTY_ZONE_1_TARGET_TEMPERATURE:
-            state["SetTemperatureZone1"] = self.round_temperature(value)
-            flags |= 0x200000080
-        elif key == PROPERTY_ZONE_2_TARGET_TEMPERATURE:
-            state["SetTemperatureZone2"] = self.round_temperature(value)
-            flags |= 0x800000200
-        elif key == PROPERTY_ZONE_1_TARGET_HEAT_FLOW_TEMPERATURE:
-            state["SetHeatFlowTemperatureZone1"] = self.round_temperature(value)
-            flags |= 0x1000000000000
-        elif key == PROPERTY_ZONE_1_TARGET_COOL_FLOW_TEMPERATURE:
-            state["SetCoolFlowTemperatureZone1"] = self.round_temperature(value)
-            flags |= 0x1000000000000
-        elif key == PROPERTY_ZONE_2_TARGET_HEAT_FLOW_TEMPERATURE:
-            state["SetHeatFlowTemperatureZone2"] = self.round_temperature(value)
-            flags |= 0x1000000000000
-        elif key == PROPERTY_ZONE_2_TARGET_COOL_FLOW_TEMPERATURE:
-            state["SetCoolFlowTemperatureZone2"] = self.round_temperature(value)
-            flags |= 0x1000000000000
-        elif key == PROPERTY_ZONE_1_OPERATION_MODE:
-            state["OperationModeZone1"] = value
-            flags |= 0x08
-        elif key == PROPERTY_ZONE_2_OPERATION_MODE:
-            state["OperationModeZone2"] = value
-            flags |= 0x10
-        else:
-            raise ValueError(f"Cannot set {key}, invalid property")
+        try:
+            state_key, convert, flag = _PROPERTY_WRITES[key]
+        except KeyError:
+            raise ValueError(f"Cannot set {key}, invalid property") from None
 
-        state[EFFECTIVE_FLAGS] = flags
+        state[state_key] = convert(self, value)
+        state[EFFECTIVE_FLAGS] = state.get(EFFECTIVE_FLAGS, 0) | flag
 
     @property
     def tank_temperature(self) -> Optional[float]:
@@ -387,18 +494,10 @@ class AtwDevice(Device):
     def zones(self) -> Optional[List[Zone]]:
         """Return zones controlled by this device.
 
-        Zones without a thermostat are not returned.
+        Zones without a thermostat are not returned. The Zone instances are reused
+        until the zone capabilities of the device change.
         """
-        _zones = []
-
-        device = self._device_conf.get("Device", {})
-        if device.get("HasThermostatZone1", False):
-            _zones.append(Zone(self, lambda: self._state, lambda: self._device_conf, 1))
-
-        if device.get("HasZone2") and device.get("HasThermostatZone2", False):
-            _zones.append(Zone(self, lambda: self._state, lambda: self._device_conf, 2))
-
-        return _zones
+        return list(self._zones)
 
     @property
     def status(self) -> Optional[str]:
@@ -407,9 +506,10 @@ class AtwDevice(Device):
         This is a Air-to-Water device specific property. MELCloud uses "OperationMode"
         to indicate what the device is currently doing to meet its control values.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return STATUS_UNKNOWN
-        return _STATE_LOOKUP.get(self._state.get("OperationMode", -1), STATUS_UNKNOWN)
+        return _STATE_LOOKUP.get(state.get("OperationMode"), STATUS_UNKNOWN)
 
     @property
     def operation_mode(self) -> Optional[str]:
@@ -417,20 +517,22 @@ class AtwDevice(Device):
 
         This value can be set using PROPERTY_OPERATION_MODE.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        if self._state.get("ForcedHotWaterMode", False):
+        if state.get("ForcedHotWaterMode", False):
             return OPERATION_MODE_FORCE_HOT_WATER
         return OPERATION_MODE_AUTO
 
     @property
     def operation_modes(self) -> List[str]:
         """Return available operation modes."""
-        return [OPERATION_MODE_AUTO, OPERATION_MODE_FORCE_HOT_WATER]
+        return list(_OPERATION_MODES)
 
     @property
     def holiday_mode(self) -> Optional[bool]:
         """Return holiday mode status."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("HolidayMode", False)
+        return state.get("HolidayMode", False)
@@ -1,11 +1,34 @@
 """MEL API access."""
+import asyncio
 from datetime import datetime, timedelta
-from typing import Any, Dict, List, Optional
+from time import monotonic
+from typing import Any, Dict, List, Optional, Tuple
 
-from aiohttp import ClientSession
+import orjson
+from aiohttp import ClientResponse, ClientSession, TCPConnector
 
 BASE_URL = "https://app.melcloud.com/Mitsubishi.Wifi.Client"
 
+_CONTENT_TYPE_JSON = {"Content-Type": "application/json"}
+
+
+def _new_session() -> ClientSession:
+    """Create a session with a connector tuned for MELCloud polling.
+
+    Connections are kept alive between polls so that the TLS handshake is not
+    repeated on every request. The keep-alive timeout leaves headroom over the
+    60 second poll interval.
+    """
+    return ClientSession(
+        connector=TCPConnector(
+            limit=32,
+            limit_per_host=8,
+            keepalive_timeout=120,
+            ttl_dns_cache=300,
+            enable_cleanup_closed=True,
+        )
+    )
+
 
 def _headers(token: str) -> Dict[str, str]:
     return {
@@ -20,6 +43,10 @@ def _headers(token: str) -> Dict[str, str]:
     }
 
 
+async def _read_json(resp: ClientResponse) -> Any:
+    return orjson.loads(await resp.read())
+
+
 async def _do_login(_session: ClientSession, email: str, password: str):
     body = {
         "Email": email,
@@ -31,9 +58,12 @@ async def _do_login(_session: ClientSession, email: str, password: str):
     }
 
     async with _session.post(
-        f"{BASE_URL}/Login/ClientLogin", json=body, raise_for_status=True
+        f"{BASE_URL}/Login/ClientLogin",
+        headers=_CONTENT_TYPE_JSON,
+        data=orjson.dumps(body),
+        raise_for_status=True,
     ) as resp:
-        return await resp.json()
+        return await _read_json(resp)
 
 
 async def login(
@@ -45,20 +75,30 @@ async def login(
     conf_update_interval: Optional[timedelta] = None,
     device_set_debounce: Optional[timedelta] = None,
 ):
-    """Login using email and password."""
-    if session:
-        response = await _do_login(session, email, password)
-    else:
-        async with ClientSession() as _session:
-            response = await _do_login(_session, email, password)
-
-    return Client(
-        response.get("LoginData").get("ContextKey"),
-        session,
-        user_update_interval=user_update_interval,
-        conf_update_interval=conf_update_interval,
-        device_set_debounce=device_set_debounce,
-    )
+    """Login using email and password.
+
+    If a session is not provided, the session created for the login request is
+    handed over to the returned Client and closed by Client.close.
+    """
+    intervals = {
+        "user_update_interval": user_update_interval,
+        "conf_update_interval": conf_update_interval,
+        "device_set_debounce": device_set_debounce,
+    }
+    _session = session if session else _new_session()
+    try:
+        response = await _do_login(_session, email, password)
+        client = Client(
+            response.get("LoginData").get("ContextKey"),
+            _session,
+            managed_session=not session,
+            **{k: v for k, v in intervals.items() if v is not None},
+        )
+    except BaseException:
+        if not session:
+            await _session.close()
+        raise
+    return client
 
 
 class Client:
@@ -68,6 +108,26 @@ class Client:
     method exposed by the __init__.py.
     """
 
+    __slots__ = (
+        "_token",
+        "_headers",
+        "_post_headers",
+        "_session",
+        "_managed_session",
+        "_user_update_interval",
+        "_conf_update_interval",
+        "_device_set_debounce",
+        "_state_ttl",
+        "_state_cache",
+        "_state_written",
+        "_update_confs_lock",
+        "_last_user_update",
+        "_last_conf_update",
+        "_device_confs",
+        "_device_conf_index",
+        "_account",
+    )
+
     def __init__(
         self,
         token: str,
@@ -76,24 +136,50 @@ class Client:
         user_update_interval=timedelta(minutes=5),
         conf_update_interval=timedelta(seconds=59),
         device_set_debounce=timedelta(seconds=1),
+        state_ttl=timedelta(seconds=10),
+        managed_session: bool = False,
     ):
-        """Initialize MELCloud client."""
+        """Initialize MELCloud client.
+
+        A provided session is closed by Client.close only if managed_session is
+        set. A session created by the client is always closed by it.
+        """
         self._token = token
+        self._headers = _headers(token)
+        self._post_headers = {**self._headers, **_CONTENT_TYPE_JSON}
         if session:
             self._session = session
-            self._managed_session = False
+            self._managed_session = managed_session
         else:
-            self._session = ClientSession()
+            self._session = _new_session()
             self._managed_session = True
-        self._user_update_interval = user_update_interval
-        self._conf_update_interval = conf_update_interval
+        self._user_update_interval = user_update_interval.total_seconds()
+        self._conf_update_interval = conf_update_interval.total_seconds()
         self._device_set_debounce = device_set_debounce
+        self._state_ttl = state_ttl.total_seconds()
+        self._state_cache: Dict[Tuple[int, int], Tuple[float, Dict[Any, Any]]] = {}
+        self._state_written: Dict[int, float] = {}
 
-        self._last_user_update = None
-        self._last_conf_update = None
+        self._update_confs_lock = asyncio.Lock()
+        self._last_user_update: Optional[float] = None
+        self._last_conf_update: Optional[float] = None
         self._device_confs: List[Dict[str, Any]] = []
+        self._device_conf_index: Dict[Tuple[int, int], Dict[str, Any]] = {}
         self._account: Optional[Dict[str, Any]] = None
 
+    async def close(self):
+        """Close the session if it was created by the client."""
+        if self._managed_session and not self._session.closed:
+            await self._session.close()
+
+    async def __aenter__(self) -> "Client":
+        """Enter the client context."""
+        return self
+
+    async def __aexit__(self, *exc_info):
+        """Close the client managed session when leaving the client context."""
+        await self.close()
+
     @property
     def token(self) -> str:
         """Return currently used token."""
@@ -109,63 +195,79 @@ class Client:
         """Return account."""
         return self._account
 
+    def get_device_conf(self, device_id: int, building_id: int) -> Dict[Any, Any]:
+        """Return device configuration of a device.
+
+        Raises KeyError if the device is not present in the device_confs.
+        """
+        return self._device_conf_index[(device_id, building_id)]
+
     async def _fetch_user_details(self):
         """Fetch user details."""
         async with self._session.get(
             f"{BASE_URL}/User/GetUserDetails",
-            headers=_headers(self._token),
+            headers=self._headers,
             raise_for_status=True,
         ) as resp:
-            self._account = await resp.json()
+            self._account = await _read_json(resp)
 
     async def _fetch_device_confs(self):
         """Fetch all configured devices."""
         url = f"{BASE_URL}/User/ListDevices"
         async with self._session.get(
-            url, headers=_headers(self._token), raise_for_status=True
+            url, headers=self._headers, raise_for_status=True
         ) as resp:
-            entries = await resp.json()
-            new_devices = []
+            entries = await _read_json(resp)
+            new_devices: List[Dict[str, Any]] = []
+            extend = new_devices.extend
             for entry in entries:
-                new_devices = new_devices + entry["Structure"]["Devices"]
-
-                for area in entry["Structure"]["Areas"]:
-                    new_devices = new_devices + area["Devices"]
-
-                for floor in entry["Structure"]["Floors"]:
-                    new_devices = new_devices + floor["Devices"]
-
+                structure = entry["Structure"]
+                extend(structure["Devices"])
+                for area in structure["Areas"]:
+                    extend(area["Devices"])
+                for floor in structure["Floors"]:
+                    extend(floor["Devices"])
                     for area in floor["Areas"]:
-                        new_devices = new_devices + area["Devices"]
+                        extend(area["Devices"])
 
-            visited = set()
-            self._device_confs = [
-                d
-                for d in new_devices
-                if d["DeviceID"] not in visited and not visited.add(d["DeviceID"])
-            ]
+            # Keep the first conf of a device listed more than once.
+            unique_devices: Dict[Any, Dict[str, Any]] = {}
+            for device in new_devices:
+                unique_devices.setdefault(device["DeviceID"], device)
+            self._device_confs = list(unique_devices.values())
+            self._device_conf_index = {
+                (d["DeviceID"], d["BuildingID"]): d for d in self._device_confs
+            }
 
     async def update_confs(self):
         """Update device_confs and account.
 
         Calls are rate limited to allow Device instances to freely poll their own
-        state while refreshing the device_confs list and account.
+        state while refreshing the device_confs list and account. Concurrent calls
+        share a single refresh.
         """
-        now = datetime.now()
-
-        if (
-            self._last_conf_update is None
-            or now - self._last_conf_update > self._conf_update_interval
-        ):
-            await self._fetch_device_confs()
-            self._last_conf_update = now
-
-        if (
-            self._last_user_update is None
-            or now - self._last_user_update > self._user_update_interval
-        ):
-            await self._fetch_user_details()
-            self._last_user_update = now
+        async with self._update_confs_lock:
+            now = monotonic()
+            update_confs = (
+                self._last_conf_update is None
+                or now - self._last_conf_update > self._conf_update_interval
+            )
+            update_user = (
+                self._last_user_update is None
+                or now - self._last_user_update > self._user_update_interval
+            )
+
+            fetches = []
+            if update_confs:
+                fetches.append(self._fetch_device_confs())
+            if update_user:
+                fetches.append(self._fetch_user_details())
+            await asyncio.gather(*fetches)
+
+            if update_confs:
+                self._last_conf_update = now
+            if update_user:
+                self._last_user_update = now
 
     async def fetch_device_units(self, device) -> Optional[Dict[Any, Any]]:
         """Fetch unit information for a device.
@@ -175,26 +277,43 @@ class Client:
         """
         async with self._session.post(
             f"{BASE_URL}/Device/ListDeviceUnits",
-            headers=_headers(self._token),
-            json={"deviceId": device.device_id},
+            headers=self._post_headers,
+            data=orjson.dumps({"deviceId": device.device_id}),
             raise_for_status=True,
         ) as resp:
-            return await resp.json()
+            return await _read_json(resp)
 
-    async def fetch_device_state(self, device) -> Optional[Dict[Any, Any]]:
+    async def fetch_device_state(
+        self, device, force: bool = False
+    ) -> Optional[Dict[Any, Any]]:
         """Fetch state information of a device.
 
         This method should not be called more than once a minute. Rate
-        limiting is left to the caller.
+        limiting is left to the caller. States fetched less than state_ttl ago
+        are returned from a cache unless force is set. Every call returns a
+        copy of the state.
         """
         device_id = device.device_id
         building_id = device.building_id
+        key = (device_id, building_id)
+        now = monotonic()
+
+        cached = self._state_cache.get(key)
+        if not force and cached is not None and now - cached[0] < self._state_ttl:
+            return dict(cached[1])
+
         async with self._session.get(
             f"{BASE_URL}/Device/Get?id={device_id}&buildingID={building_id}",
-            headers=_headers(self._token),
+            headers=self._headers,
             raise_for_status=True,
         ) as resp:
-            return await resp.json()
+            state = await _read_json(resp)
+
+        # A state requested before a write to the device completed may predate
+        # the write and is not cached.
+        if self._state_written.get(device_id, now) <= now:
+            self._state_cache[key] = (now, state)
+        return dict(state)
 
     async def fetch_energy_report(self, device) -> Optional[Dict[Any, Any]]:
         """Fetch energy report containing today and 1-2 days from the past."""
@@ -204,16 +323,18 @@ class Client:
 
         async with self._session.post(
             f"{BASE_URL}/EnergyCost/Report",
-            headers=_headers(self._token),
-            json={
-                "DeviceId": device_id,
-                "UseCurrency": False,
-                "FromDate": f"{from_str}T00:00:00",
-                "ToDate": f"{to_str}T00:00:00"
-            },
+            headers=self._post_headers,
+            data=orjson.dumps(
+                {
+                    "DeviceId": device_id,
+                    "UseCurrency": False,
+                    "FromDate": f"{from_str}T00:00:00",
+                    "ToDate": f"{to_str}T00:00:00",
+                }
+            ),
             raise_for_status=True,
         ) as resp:
-            return await resp.json()
+            return await _read_json(resp)
 
     async def set_device_state(self, device):
         """Update device state.
@@ -233,8 +354,14 @@ class Client:
 
         async with self._session.post(
             f"{BASE_URL}/Device/{setter}",
-            headers=_headers(self._token),
-            json=device,
+            headers=self._post_headers,
+            data=orjson.dumps(device),
             raise_for_status=True,
         ) as resp:
-            return await resp.json()
+            state = await _read_json(resp)
+
+        device_id = device.get("DeviceID")
+        self._state_written[device_id] = monotonic()
+        for key in [k for k in self._state_cache if k[0] == device_id]:
+            del self._state_cache[key]
+        return state
@@ -1,8 +1,8 @@
 """Base MELCloud device."""
 import asyncio
+import math
 from abc import ABC, abstractmethod
 from datetime import datetime, timedelta, timezone
-from decimal import Decimal, ROUND_HALF_UP
 from typing import Any, Dict, List, Optional
 
 from pymelcloud.client import Client
@@ -19,10 +19,74 @@ PROPERTY_POWER = "power"
 EFFECTIVE_FLAGS = "EffectiveFlags"
 HAS_PENDING_COMMAND = "HasPendingCommand"
 
+_ENERGY_REPORT_MODES = ("Heating", "Cooling", "Auto", "Dry", "Fan", "Other")
+
+
+def _parse_timestamp(value: str) -> datetime:
+    """Parse a MELCloud YYYY-MM-DDTHH:MM:SS[.f] timestamp.
+
+    The layout is parsed by hand instead of with datetime.fromisoformat whose
+    accepted formats, including UTC offsets, vary between Python versions.
+    """
+    fraction = value[20:]
+    if (
+        len(value) < 19
+        or value[4:17:3] != "--T::"
+        or (
+            len(value) > 19
+            and (value[19] != "." or len(fraction) > 6 or not fraction.isdigit())
+        )
+    ):
+        raise ValueError(f"Invalid timestamp [{value}]")
+    return datetime(
+        int(value[0:4]),
+        int(value[5:7]),
+        int(value[8:10]),
+        int(value[11:13]),
+        int(value[14:16]),
+        int(value[17:19]),
+        int(fraction.ljust(6, "0")) if fraction else 0,
+    )
+
+
+def _unit_info(unit: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "model_number": unit.get("ModelNumber"),
+        "model": unit.get("Model"),
+        "serial_number": unit.get("SerialNumber"),
+    }
+
+
+def _temp_unit(account: Optional[Dict[Any, Any]]) -> str:
+    if account is not None and account.get("UseFahrenheit", False):
+        return UNIT_TEMP_FAHRENHEIT
+    return UNIT_TEMP_CELSIUS
+
 
 class Device(ABC):
     """MELCloud base device representation."""
 
+    __slots__ = (
+        "device_id",
+        "building_id",
+        "mac",
+        "serial",
+        "access_level",
+        "_temp_unit",
+        "_device_conf",
+        "_conf_dev",
+        "_device_type",
+        "_state",
+        "_device_units",
+        "_energy_report",
+        "_client",
+        "_set_debounce_seconds",
+        "_write_waiter",
+        "_write_handle",
+        "_write_task",
+        "_pending_writes",
+    )
+
     def __init__(
         self,
         device_conf: Dict[str, Any],
@@ -36,25 +100,34 @@ class Device(ABC):
         self.serial = device_conf.get("SerialNumber")
         self.access_level = device_conf.get("AccessLevel")
 
-        self._use_fahrenheit = False
-        if client.account is not None:
-            self._use_fahrenheit = client.account.get("UseFahrenheit", False)
+        self._temp_unit = _temp_unit(client.account)
 
-        self._device_conf = device_conf
+        self._update_device_conf(device_conf)
         self._state = None
         self._device_units = None
         self._energy_report = None
         self._client = client
 
-        self._set_debounce = set_debounce
-        self._set_event = asyncio.Event()
+        self._set_debounce_seconds = set_debounce.total_seconds()
+        self._write_waiter: Optional[asyncio.Future[None]] = None
+        self._write_handle: Optional[asyncio.TimerHandle] = None
         self._write_task: Optional[asyncio.Future[None]] = None
         self._pending_writes: Dict[str, Any] = {}
 
+    def _update_device_conf(self, device_conf: Dict[str, Any]):
+        """Replace the device conf and values derived from it.
+
+        Subclasses caching conf derived values refresh them here.
+        """
+        self._device_conf = device_conf
+        self._conf_dev: Dict[str, Any] = device_conf.get("Device") or {}
+        self._device_type = DEVICE_TYPE_LOOKUP.get(
+            self._conf_dev.get("DeviceType", -1), DEVICE_TYPE_UNKNOWN,
+        )
+
     def get_device_prop(self, name: str) -> Optional[Any]:
         """Access device properties while shortcutting the nested device access."""
-        device = self._device_conf.get("Device", {})
-        return device.get(name)
+        return self._conf_dev.get(name)
 
     def get_state_prop(self, name: str) -> Optional[Any]:
         """Access state prop without None check."""
@@ -63,11 +136,13 @@ class Device(ABC):
         return self._state.get(name)
 
     def round_temperature(self, temperature: float) -> float:
-        """Round a temperature to the nearest temperature increment."""
-        return float(
-            Decimal(str(temperature / self.temperature_increment))
-            .quantize(Decimal('1'), rounding=ROUND_HALF_UP)
-        ) * self.temperature_increment
+        """Round a temperature to the nearest temperature increment.
+
+        Halfway values are rounded away from zero.
+        """
+        increment = self.temperature_increment
+        steps = temperature / increment
+        return math.copysign(math.floor(abs(steps) + 0.5), steps) * increment
 
     @abstractmethod
     def apply_write(self, state: Dict[str, Any], key: str, value: Any):
@@ -77,6 +152,15 @@ class Device(ABC):
         """
         pass
 
+    def _apply_writes(self, state: Dict[str, Any], properties: Dict[str, Any]):
+        """Apply a batch of property writes to state object."""
+        for k, value in properties.items():
+            if k == PROPERTY_POWER:
+                state["Power"] = value
+                state[EFFECTIVE_FLAGS] = state.get(EFFECTIVE_FLAGS, 0) | 0x01
+            else:
+                self.apply_write(state, k, value)
+
     async def update(self):
         """Fetch state of the device from MELCloud.
 
@@ -87,53 +171,104 @@ class Device(ABC):
         exception of changes performed through MELCloud directly.
         """
         await self._client.update_confs()
-        self._device_conf = next(
-            c
-            for c in self._client.device_confs
-            if c.get("DeviceID") == self.device_id
-            and c.get("BuildingID") == self.building_id
+        self._update_device_conf(
+            self._client.get_device_conf(self.device_id, self.building_id)
+        )
+        self._temp_unit = _temp_unit(self._client.account)
+        self._state, self._energy_report = await asyncio.gather(
+            self._client.fetch_device_state(self),
+            self._client.fetch_energy_report(self),
         )
-        self._state = await self._client.fetch_device_state(self)
-        self._energy_report = await self._client.fetch_energy_report(self)
 
         if self._device_units is None and self.access_level != ACCESS_LEVEL.get(
             "GUEST"
         ):
-            self._device_units = await self._client.fetch_device_units(self)
+            device_units = await self._client.fetch_device_units(self)
+            if device_units is not None:
+                self._device_units = [_unit_info(unit) for unit in device_units]
 
     async def set(self, properties: Dict[str, Any]):
-        """Schedule property write to MELCloud."""
-        if self._write_task is not None:
-            self._write_task.cancel()
+        """Schedule property write to MELCloud.
 
-        for k, value in properties.items():
-            if k == PROPERTY_POWER:
-                continue
-            self.apply_write({}, k, value)
+        Writes scheduled within the debounce time of each other are coalesced into
+        a single request. Errors raised while writing are raised to every caller
+        waiting for the write. Properties are written even when they match the
+        last fetched state as the device may have been changed elsewhere since.
+        """
+        self._apply_writes({}, properties)
+
+        if (
+            not properties
+            and not self._pending_writes
+            and (self._write_task is None or self._write_task.done())
+        ):
+            return
 
         self._pending_writes.update(properties)
 
-        self._write_task = asyncio.ensure_future(self._write())
-        await self._set_event.wait()
+        loop = asyncio.get_event_loop()
+        if self._write_waiter is None or self._write_waiter.done():
+            self._write_waiter = loop.create_future()
+        waiter = self._write_waiter
 
-    async def _write(self):
-        await asyncio.sleep(self._set_debounce.total_seconds())
-        new_state = self._state.copy()
+        if self._write_handle is not None:
+            self._write_handle.cancel()
+        self._write_handle = loop.call_later(
+            self._set_debounce_seconds, self._start_write
+        )
+        await asyncio.shield(waiter)
 
-        for k, value in self._pending_writes.items():
-            if k == PROPERTY_POWER:
-                new_state["Power"] = value
-                new_state[EFFECTIVE_FLAGS] = new_state.get(EFFECTIVE_FLAGS, 0) | 0x01
-            else:
-                self.apply_write(new_state, k, value)
+    def _start_write(self):
+        self._write_handle = None
+        if self._write_task is None or self._write_task.done():
+            self._write_task = asyncio.ensure_future(self._write())
+
+    async def _write(self):
+        # Writes arriving during an in-flight request are flushed right after it,
+        # unless a new debounce period is still running. Each batch resolves its
+        # own waiter so that callers joining mid-flight wait for the next batch.
+        while self._pending_writes and self._write_handle is None:
+            pending_writes = self._pending_writes
+            self._pending_writes = {}
+            waiter = self._write_waiter
+            self._write_waiter = None
+            try:
+                if self._state is None:
+                    # Written before the first update, read the current state.
+                    self._state = await self._client.fetch_device_state(
+                        self, force=True
+                    )
+                state = self._state
+                # Apply the writes to an overlay and merge it into a copy of the
+                # state only for the request.
+                overlay = {EFFECTIVE_FLAGS: state.get(EFFECTIVE_FLAGS, 0)}
+                self._apply_writes(overlay, pending_writes)
+
+                if overlay[EFFECTIVE_FLAGS] != 0:
+                    overlay[HAS_PENDING_COMMAND] = True
+
+                self._state = await self._client.set_device_state(
+                    {**state, **overlay}
+                )
+            except asyncio.CancelledError:
+                # Keep the interrupted writes around for the next write.
+                self._pending_writes = {**pending_writes, **self._pending_writes}
+                if waiter is not None:
+                    waiter.cancel()
+                raise
+            except Exception as err:  # pylint: disable=broad-except
+                if waiter is not None and not waiter.done():
+                    waiter.set_exception(err)
+                continue
 
-        if new_state[EFFECTIVE_FLAGS] != 0:
-            new_state.update({HAS_PENDING_COMMAND: True})
+            if waiter is not None and not waiter.done():
+                waiter.set_result(None)
 
-        self._pending_writes = {}
-        self._state = await self._client.set_device_state(new_state)
-        self._set_event.set()
-        self._set_event.clear()
+        # Callers left waiting here had no properties to write.
+        waiter = self._write_waiter
+        if self._write_handle is None and waiter is not None and not waiter.done():
+            self._write_waiter = None
+            waiter.set_result(None)
 
     @property
     def name(self) -> str:
@@ -143,39 +278,24 @@ class Device(ABC):
     @property
     def device_type(self) -> str:
         """Return type of the device."""
-        return DEVICE_TYPE_LOOKUP.get(
-            self._device_conf.get("Device", {}).get("DeviceType", -1),
-            DEVICE_TYPE_UNKNOWN,
-        )
+        return self._device_type
 
     @property
     def units(self) -> Optional[List[dict]]:
         """Return device model info."""
         if self._device_units is None:
             return None
-
-        infos: List[dict] = []
-        for unit in self._device_units:
-            infos.append(
-                {
-                    "model_number": unit.get("ModelNumber"),
-                    "model": unit.get("Model"),
-                    "serial_number": unit.get("SerialNumber"),
-                }
-            )
-        return infos
+        return [dict(unit) for unit in self._device_units]
 
     @property
     def temp_unit(self) -> str:
         """Return temperature unit used by the device."""
-        if self._use_fahrenheit:
-            return UNIT_TEMP_FAHRENHEIT
-        return UNIT_TEMP_CELSIUS
+        return self._temp_unit
 
     @property
     def temperature_increment(self) -> float:
         """Return temperature increment."""
-        return self._device_conf.get("Device", {}).get("TemperatureIncrement", 0.5)
+        return self._conf_dev.get("TemperatureIncrement", 0.5)
 
     @property
     def last_seen(self) -> Optional[datetime]:
@@ -183,18 +303,20 @@ class Device(ABC):
 
         The timestamp is in UTC.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return datetime.strptime(
-            self._state.get("LastCommunication"), "%Y-%m-%dT%H:%M:%S.%f"
-        ).replace(tzinfo=timezone.utc)
+        return _parse_timestamp(state.get("LastCommunication")).replace(
+            tzinfo=timezone.utc
+        )
 
     @property
     def power(self) -> Optional[bool]:
         """Return power on / standby state of the device."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("Power")
+        return state.get("Power")
 
     @property
     def daily_energy_consumed(self) -> Optional[float]:
@@ -212,34 +334,30 @@ class Device(ABC):
         TLDR: Request some days from the past and some days from the future -> receive
         the latest day bucket.
         """
-        if self._energy_report is None:
+        energy_report = self._energy_report
+        if energy_report is None:
             return None
 
-        consumption = 0
-
-        for mode in ['Heating', 'Cooling', 'Auto', 'Dry', 'Fan', 'Other']:
-            previous_reports = self._energy_report.get(mode, [0.0])
-            if previous_reports:
-                last_report = previous_reports[-1]
-            else:
-                last_report = 0.0
-            consumption += last_report
-
-        return consumption
+        return sum(
+            reports[-1]
+            for reports in map(energy_report.get, _ENERGY_REPORT_MODES)
+            if reports
+        )
 
     @property
     def wifi_signal(self) -> Optional[int]:
         """Return wifi signal in dBm (negative value)."""
         if self._device_conf is None:
             return None
-        return self._device_conf.get("Device", {}).get("WifiSignalStrength", None)
+        return self._conf_dev.get("WifiSignalStrength", None)
 
     @property
     def has_error(self) -> bool:
         """Return True if the device has error state."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return False
-        return self._state.get("HasError", False)
+        return state.get("HasError", False)
 
     @property
     def error_code(self) -> Optional[str]:
@@ -247,6 +365,7 @@ class Device(ABC):
         This is a property that probably should be checked if "has_error" = true
         Till now I have a fixed code = 8000 and never have error on the units
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("ErrorCode", None)
+        return state.get("ErrorCode", None)
@@ -1,5 +1,6 @@
 """Energy-Recovery-Ventilation (DeviceType=3) device definition."""
-from typing import Any, Dict, List, Optional
+from types import MappingProxyType
+from typing import Any, Callable, Dict, List, Mapping, Optional, Tuple
 
 from pymelcloud.device import EFFECTIVE_FLAGS, Device
 
@@ -9,32 +10,47 @@ PROPERTY_FAN_SPEED = "fan_speed"
 FAN_SPEED_UNDEFINED = "undefined"
 FAN_SPEED_STOPPED = "0"
 
+_FAN_SPEEDS = tuple(str(num) for num in range(1, 16))
+_FAN_SPEED_LOOKUP = MappingProxyType(
+    {
+        -1: FAN_SPEED_UNDEFINED,
+        0: FAN_SPEED_STOPPED,
+        **dict(enumerate(_FAN_SPEEDS, start=1)),
+    }
+)
+_REVERSE_FAN_SPEED_LOOKUP = MappingProxyType(
+    {value: key for key, value in _FAN_SPEED_LOOKUP.items()}
+)
+
 VENTILATION_MODE_RECOVERY = "recovery"
 VENTILATION_MODE_BYPASS = "bypass"
 VENTILATION_MODE_AUTO = "auto"
 VENTILATION_MODE_UNDEFINED = "undefined"
 
-_VENTILATION_MODE_LOOKUP = {
-    0: VENTILATION_MODE_RECOVERY,
-    1: VENTILATION_MODE_BYPASS,
-    2: VENTILATION_MODE_AUTO,
-}
+_VENTILATION_MODE_LOOKUP = MappingProxyType(
+    {
+        0: VENTILATION_MODE_RECOVERY,
+        1: VENTILATION_MODE_BYPASS,
+        2: VENTILATION_MODE_AUTO,
+    }
+)
+_REVERSE_VENTILATION_MODE_LOOKUP = MappingProxyType(
+    {value: key for key, value in _VENTILATION_MODE_LOOKUP.items()}
+)
 
 
 def _fan_speed_from(speed: int) -> str:
-    if speed == -1:
-        return FAN_SPEED_UNDEFINED
-    if speed == 0:
-        return FAN_SPEED_STOPPED
-    return str(speed)
+    try:
+        return _FAN_SPEED_LOOKUP[speed]
+    except KeyError:
+        return str(speed)
 
 
 def _fan_speed_to(speed: str) -> int:
-    if speed == FAN_SPEED_UNDEFINED:
-        return -1
-    if speed == FAN_SPEED_STOPPED:
-        return 0
-    return int(speed)
+    try:
+        return _REVERSE_FAN_SPEED_LOOKUP[speed]
+    except KeyError:
+        return int(speed)
 
 
 def _ventilation_mode_from(mode: int) -> str:
@@ -42,42 +58,65 @@ def _ventilation_mode_from(mode: int) -> str:
 
 
 def _ventilation_mode_to(mode: str) -> int:
-    for k, value in _VENTILATION_MODE_LOOKUP.items():
-        if value == mode:
-            return k
-    raise ValueError(f"Invalid ventilation_mode [{mode}]")
+    try:
+        return _REVERSE_VENTILATION_MODE_LOOKUP[mode]
+    except KeyError:
+        raise ValueError(f"Invalid ventilation_mode [{mode}]") from None
+
+
+_PropertyWrite = Tuple[str, Callable[[Any, Any], Any], int]
+
+_PROPERTY_WRITES: Mapping[str, _PropertyWrite] = MappingProxyType(
+    {
+        PROPERTY_VENTILATION_MODE: (
+            "VentilationMode",
+            lambda _, value: _ventilation_mode_to(value),
+            0x04,
+        ),
+        PROPERTY_FAN_SPEED: (
+            "SetFanSpeed",
+            lambda _, value: _fan_speed_to(value),
+            0x08,
+        ),
+    }
+)
 
 
 class ErvDevice(Device):
     """Energy-Recovery-Ventilation device."""
 
+    __slots__ = ("_ventilation_modes",)
+
+    def _update_device_conf(self, device_conf: Dict[str, Any]):
+        super()._update_device_conf(device_conf)
+        conf_dev = self._conf_dev
+        modes: List[str] = [VENTILATION_MODE_RECOVERY]
+
+        if conf_dev.get("HasBypassVentilationMode", False):
+            modes.append(VENTILATION_MODE_BYPASS)
+
+        if conf_dev.get("HasAutoVentilationMode", False):
+            modes.append(VENTILATION_MODE_AUTO)
+
+        self._ventilation_modes = tuple(modes)
+
     def apply_write(self, state: Dict[str, Any], key: str, value: Any):
         """Apply writes to state object.
 
         Used for property validation, do not modify device state.
         """
-        flags = state.get(EFFECTIVE_FLAGS, 0)
-
-        if key == PROPERTY_VENTILATION_MODE:
-            state["VentilationMode"] = _ventilation_mode_to(value)
-            flags = flags | 0x04
-        elif key == PROPERTY_FAN_SPEED:
-            state["SetFanSpeed"] = _fan_speed_to(value)
-            flags = flags | 0x08
-        else:
-            raise ValueError(f"Cannot set {key}, invalid property")
+        try:
+            state_key, convert, flag = _PROPERTY_WRITES[key]
+        except KeyError:
+            raise ValueError(f"Cannot set {key}, invalid property") from None
 
-        state[EFFECTIVE_FLAGS] = flags
-
-    def _device(self) -> Dict[str, Any]:
-        return self._device_conf.get("Device", {})
+        state[state_key] = convert(self, value)
+        state[EFFECTIVE_FLAGS] = state.get(EFFECTIVE_FLAGS, 0) | flag
 
     @property
     def has_energy_consumed_meter(self) -> bool:
         """Return True if the device has an energy consumption meter."""
-        if self._device_conf is None:
-            return False
-        return self._device().get("HasEnergyConsumedMeter", False)
+        return self._conf_dev.get("HasEnergyConsumedMeter", False)
 
     @property
     def total_energy_consumed(self) -> Optional[float]:
@@ -86,9 +125,7 @@ class ErvDevice(Device):
         The update interval is extremely slow and inconsistent. Empirical evidence
         suggests can vary between 1h 30min and 3h.
         """
-        if self._device_conf is None:
-            return None
-        reading = self._device().get("CurrentEnergyConsumed", None)
+        reading = self._conf_dev.get("CurrentEnergyConsumed", None)
         if reading is None:
             return None
         return reading / 1000.0
@@ -107,30 +144,33 @@ class ErvDevice(Device):
     @property
     def room_temperature(self) -> Optional[float]:
         """Return room temperature reported by the device."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("RoomTemperature")
+        return state.get("RoomTemperature")
 
     @property
     def outside_temperature(self) -> Optional[float]:
         """Return outdoor temperature reported by the device."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return self._state.get("OutdoorTemperature")
+        return state.get("OutdoorTemperature")
 
     @property
     def ventilation_mode(self) -> Optional[str]:
         """Return currently active ventilation mode."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return _ventilation_mode_from(self._state.get("VentilationMode", -1))
+        return _ventilation_mode_from(state.get("VentilationMode", -1))
 
     @property
     def actual_ventilation_mode(self) -> Optional[str]:
         """Return actual ventilation mode."""
         if self._state is None:
             return None
-        return _ventilation_mode_from(self._device().get("ActualVentilationMode", -1))
+        return _ventilation_mode_from(self._conf_dev.get("ActualVentilationMode", -1))
 
     @property
     def fan_speed(self) -> Optional[str]:
@@ -138,9 +178,10 @@ class ErvDevice(Device):
 
         The argument must be one of the fan speeds returned by fan_speeds.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        return _fan_speed_from(self._state.get("SetFanSpeed", -1))
+        return _fan_speed_from(state.get("SetFanSpeed", -1))
 
     @property
     def actual_supply_fan_speed(self) -> Optional[str]:
@@ -150,7 +191,7 @@ class ErvDevice(Device):
         """
         if self._state is None:
             return None
-        return _fan_speed_from(self._device().get("ActualSupplyFanSpeed", -1))
+        return _fan_speed_from(self._conf_dev.get("ActualSupplyFanSpeed", -1))
 
     @property
     def actual_exhaust_fan_speed(self) -> Optional[str]:
@@ -160,39 +201,34 @@ class ErvDevice(Device):
         """
         if self._state is None:
             return None
-        return _fan_speed_from(self._device().get("ActualExhaustFanSpeed", -1))
+        return _fan_speed_from(self._conf_dev.get("ActualExhaustFanSpeed", -1))
 
     @property
     def core_maintenance_required(self) -> bool:
         """Return True if core maintenance required."""
-        if self._device_conf is None:
-            return False
-        return self._device().get("CoreMaintenanceRequired", False)
+        return self._conf_dev.get("CoreMaintenanceRequired", False)
 
     @property
     def filter_maintenance_required(self) -> bool:
         """Return True if filter maintenance required."""
-        if self._device_conf is None:
-            return False
-        return self._device().get("FilterMaintenanceRequired", False)
+        return self._conf_dev.get("FilterMaintenanceRequired", False)
 
     @property
     def night_purge_mode(self) -> bool:
         """Return True if NightPurgeMode."""
-        if self._device_conf is None:
-            return False
-        return self._device().get("NightPurgeMode", False)
+        return self._conf_dev.get("NightPurgeMode", False)
 
     @property
     def room_co2_level(self) -> Optional[float]:
         """Return co2 level if supported by the device."""
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
 
-        if not self._state.get("HasCO2Sensor", False):
+        if not state.get("HasCO2Sensor", False):
             return None
 
-        return self._device().get("RoomCO2Level", None)
+        return self._conf_dev.get("RoomCO2Level", None)
 
     @property
     def fan_speeds(self) -> Optional[List[str]]:
@@ -214,12 +250,12 @@ class ErvDevice(Device):
         MELCloud is not aware of the device type making it infeasible to match the
         fan speed names with the device documentation.
         """
-        if self._state is None:
+        state = self._state
+        if state is None:
             return None
-        speeds = []
-
-        num_fan_speeds = self._state.get("NumberOfFanSpeeds", 0)
-        for num in range(1, num_fan_speeds + 1):
+        num_fan_speeds = max(state.get("NumberOfFanSpeeds", 0), 0)
+        speeds = list(_FAN_SPEEDS[:num_fan_speeds])
+        for num in range(len(_FAN_SPEEDS) + 1, num_fan_speeds + 1):
             speeds.append(_fan_speed_from(num))
 
         return speeds
@@ -227,14 +263,4 @@ class ErvDevice(Device):
     @property
     def ventilation_modes(self) -> List[str]:
         """Return available ventilation modes."""
-        modes: List[str] = [VENTILATION_MODE_RECOVERY]
-
-        device = self._device()
-
-        if device.get("HasBypassVentilationMode", False):
-            modes.append(VENTILATION_MODE_BYPASS)
-
-        if device.get("HasAutoVentilationMode", False):
-            modes.append(VENTILATION_MODE_AUTO)
-
-        return modes
+        return list(self._ventilation_modes)
@@ -20,6 +20,6 @@ setup(
         "Topic :: Software Development :: Libraries :: Application Frameworks",
         "Topic :: Home Automation",
     ],
-    install_requires=["aiohttp"],
+    install_requires=["aiohttp", "orjson"],
     scripts=[],
 )
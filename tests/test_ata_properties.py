@@ -1,9 +1,6 @@
 """ATA tests."""
-import json
-import os
-
 import pytest
-from asynctest import CoroutineMock, Mock, patch
+from asynctest import CoroutineMock
 from aiohttp.web import HTTPForbidden
 from pymelcloud import DEVICE_TYPE_ATA
 from pymelcloud.const import ACCESS_LEVEL
@@ -32,24 +29,15 @@ from pymelcloud.ata_device import (
     H_VANE_POSITION_UNDEFINED,
     AtaDevice,
 )
+from .util import build_device
 
 
-def _build_device(device_conf_name: str, device_state_name: str) -> AtaDevice:
-    test_dir = os.path.join(os.path.dirname(__file__), "samples")
-    with open(os.path.join(test_dir, device_conf_name), "r") as json_file:
-        device_conf = json.load(json_file)
-
-    with open(os.path.join(test_dir, device_state_name), "r") as json_file:
-        device_state = json.load(json_file)
-
-    with patch("pymelcloud.client.Client") as _client:
-        _client.update_confs = CoroutineMock()
-        _client.device_confs.__iter__ = Mock(return_value=[device_conf].__iter__())
-        _client.fetch_device_units = CoroutineMock(return_value=[])
-        _client.fetch_device_state = CoroutineMock(return_value=device_state)
-        _client.fetch_energy_report = CoroutineMock(return_value=None)
-        client = _client
-
+def _build_device(
+    device_conf_name: str, device_state_name: str, load_state: bool = True
+) -> AtaDevice:
+    device_conf, client = build_device(
+        device_conf_name, device_state_name, load_state=load_state
+    )
     return AtaDevice(device_conf, client)
 
 
@@ -86,10 +74,30 @@ async def test_ata():
 
     assert device.vane_vertical == V_VANE_POSITION_AUTO
     assert device.vane_horizontal == H_VANE_POSITION_3
+    assert device.vane_vertical_positions == [
+        V_VANE_POSITION_AUTO,
+        V_VANE_POSITION_1,
+        V_VANE_POSITION_2,
+        V_VANE_POSITION_3,
+        V_VANE_POSITION_4,
+        V_VANE_POSITION_5,
+        V_VANE_POSITION_SWING,
+    ]
+    assert device.vane_horizontal_positions == [
+        H_VANE_POSITION_AUTO,
+        H_VANE_POSITION_1,
+        H_VANE_POSITION_2,
+        H_VANE_POSITION_3,
+        H_VANE_POSITION_4,
+        H_VANE_POSITION_5,
+        H_VANE_POSITION_SPLIT,
+        H_VANE_POSITION_SWING,
+    ]
 
     assert device.wifi_signal == -51
     assert device.has_error is False
     assert device.error_code == 8000
+    assert str(device.last_seen) == "2020-07-03 09:03:50.320000+00:00"
 
 
 @pytest.mark.asyncio
@@ -99,3 +107,24 @@ async def test_ata_guest():
     assert device.device_type == DEVICE_TYPE_ATA
     assert device.access_level == ACCESS_LEVEL["GUEST"]
     await device.update()
+
+
+def test_ata_apply_fan_speed():
+    device = _build_device("ata_listdevice.json", "ata_get.json", load_state=False)
+
+    for speed, expected in [("auto", 0), ("3", 3), ("20", 20)]:
+        state = {}
+        device.apply_write(state, "fan_speed", speed)
+        assert state == {"SetFanSpeed": expected, "EffectiveFlags": 0x08}
+
+    with pytest.raises(ValueError):
+        device.apply_write({}, "fan_speed", "invalid")
+
+
+@pytest.mark.asyncio
+async def test_ata_fan_speeds_negative_count():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    await device.update()
+    device._state["NumberOfFanSpeeds"] = -1
+
+    assert device.fan_speeds == ["auto"]
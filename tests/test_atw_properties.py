@@ -12,16 +12,32 @@ from pymelcloud.atw_device import (
     ZONE_OPERATION_MODE_CURVE,
     ZONE_OPERATION_MODE_HEAT_FLOW,
     ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
+    ZONE_OPERATION_MODE_UNKNOWN,
     ZONE_STATUS_HEAT,
     ZONE_STATUS_IDLE,
     ZONE_STATUS_UNKNOWN,
     AtwDevice,
 )
-from .util import build_device
+from .util import build_device, snapshot_zone
 
+_OPERATION_MODES = [OPERATION_MODE_AUTO, OPERATION_MODE_FORCE_HOT_WATER]
+_HEAT_ZONE_OPERATION_MODES = [
+    ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
+    ZONE_OPERATION_MODE_HEAT_FLOW,
+    ZONE_OPERATION_MODE_CURVE,
+]
+_COOL_ZONE_OPERATION_MODES = _HEAT_ZONE_OPERATION_MODES + [
+    ZONE_OPERATION_MODE_COOL_THERMOSTAT,
+    ZONE_OPERATION_MODE_COOL_FLOW,
+]
 
-def _build_device(device_conf_name: str, device_state_name: str) -> AtwDevice:
-    device_conf, client = build_device(device_conf_name, device_state_name)
+
+def _build_device(
+    device_conf_name: str, device_state_name: str, load_state: bool = True
+) -> AtwDevice:
+    device_conf, client = build_device(
+        device_conf_name, device_state_name, load_state=load_state
+    )
     return AtwDevice(device_conf, client)
 
 
@@ -34,10 +50,7 @@ async def test_1zone():
     assert device.temperature_increment == 0.5
 
     assert device.operation_mode is None
-    assert device.operation_modes == [
-        OPERATION_MODE_AUTO,
-        OPERATION_MODE_FORCE_HOT_WATER,
-    ]
+    assert device.operation_modes == _OPERATION_MODES
     assert device.tank_temperature is None
     assert device.status is STATUS_UNKNOWN
     assert device.target_tank_temperature is None
@@ -54,20 +67,18 @@ async def test_1zone():
     zones = device.zones
 
     assert len(zones) == 1
-    assert zones[0].name == "Zone 1"
-    assert zones[0].zone_index == 1
-    assert zones[0].room_temperature is None
-    assert zones[0].target_temperature is None
-    assert zones[0].flow_temperature == 57.5
-    assert zones[0].return_temperature == 53.0
-    assert zones[0].target_flow_temperature is None
-    assert zones[0].operation_mode is None
-    assert zones[0].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-    ]
-    assert zones[0].status == ZONE_STATUS_UNKNOWN
+    assert snapshot_zone(zones[0]) == {
+        "name": "Zone 1",
+        "zone_index": 1,
+        "room_temperature": None,
+        "target_temperature": None,
+        "flow_temperature": 57.5,
+        "return_temperature": 53.0,
+        "target_flow_temperature": None,
+        "operation_mode": None,
+        "operation_modes": _HEAT_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_UNKNOWN,
+    }
 
     await device.update()
 
@@ -83,16 +94,18 @@ async def test_1zone():
     assert device.has_error is False
     assert device.error_code == 8000
 
-    assert zones[0].room_temperature == 27.0
-    assert zones[0].target_temperature == 30
-    assert zones[0].target_flow_temperature == 60.0
-    assert zones[0].operation_mode == ZONE_OPERATION_MODE_HEAT_FLOW
-    assert zones[0].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-    ]
-    assert zones[0].status == ZONE_STATUS_HEAT
+    assert snapshot_zone(zones[0]) == {
+        "name": "Zone 1",
+        "zone_index": 1,
+        "room_temperature": 27.0,
+        "target_temperature": 30,
+        "flow_temperature": 57.5,
+        "return_temperature": 53.0,
+        "target_flow_temperature": 60.0,
+        "operation_mode": ZONE_OPERATION_MODE_HEAT_FLOW,
+        "operation_modes": _HEAT_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_HEAT,
+    }
 
 
 @pytest.mark.asyncio
@@ -104,10 +117,7 @@ async def test_2zone():
     assert device.temperature_increment == 0.5
 
     assert device.operation_mode is None
-    assert device.operation_modes == [
-        OPERATION_MODE_AUTO,
-        OPERATION_MODE_FORCE_HOT_WATER,
-    ]
+    assert device.operation_modes == _OPERATION_MODES
     assert device.tank_temperature is None
     assert device.status is STATUS_UNKNOWN
     assert device.target_tank_temperature is None
@@ -124,35 +134,31 @@ async def test_2zone():
     zones = device.zones
 
     assert len(zones) == 2
-    assert zones[0].name == "Downstairs"
-    assert zones[0].zone_index == 1
-    assert zones[0].room_temperature is None
-    assert zones[0].target_temperature is None
-    assert zones[0].flow_temperature == 36.0
-    assert zones[0].return_temperature == 30.0
-    assert zones[0].target_flow_temperature is None
-    assert zones[0].operation_mode is None
-    assert zones[0].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-    ]
-    assert zones[0].status == ZONE_STATUS_UNKNOWN
-
-    assert zones[1].name == "Upstairs"
-    assert zones[1].zone_index == 2
-    assert zones[1].room_temperature is None
-    assert zones[1].target_temperature is None
-    assert zones[1].flow_temperature == 36.0
-    assert zones[1].return_temperature == 30.0
-    assert zones[1].target_flow_temperature is None
-    assert zones[1].operation_mode is None
-    assert zones[1].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-    ]
-    assert zones[1].status == ZONE_STATUS_UNKNOWN
+    assert snapshot_zone(zones[0]) == {
+        "name": "Downstairs",
+        "zone_index": 1,
+        "room_temperature": None,
+        "target_temperature": None,
+        "flow_temperature": 36.0,
+        "return_temperature": 30.0,
+        "target_flow_temperature": None,
+        "operation_mode": None,
+        "operation_modes": _HEAT_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_UNKNOWN,
+    }
+
+    assert snapshot_zone(zones[1]) == {
+        "name": "Upstairs",
+        "zone_index": 2,
+        "room_temperature": None,
+        "target_temperature": None,
+        "flow_temperature": 36.0,
+        "return_temperature": 30.0,
+        "target_flow_temperature": None,
+        "operation_mode": None,
+        "operation_modes": _HEAT_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_UNKNOWN,
+    }
 
     await device.update()
 
@@ -168,27 +174,31 @@ async def test_2zone():
     assert device.has_error is False
     assert device.error_code == 8000
 
-    assert zones[0].room_temperature == 20.5
-    assert zones[0].target_temperature == 19.5
-    assert zones[0].target_flow_temperature == 25.0
-    assert zones[0].operation_mode == ZONE_OPERATION_MODE_HEAT_THERMOSTAT
-    assert zones[0].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-    ]
-    assert zones[0].status == ZONE_STATUS_HEAT
-
-    assert zones[1].room_temperature == 19.5
-    assert zones[1].target_temperature == 18
-    assert zones[1].target_flow_temperature == 25.0
-    assert zones[1].operation_mode == ZONE_OPERATION_MODE_HEAT_THERMOSTAT
-    assert zones[1].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-    ]
-    assert zones[1].status == ZONE_STATUS_HEAT
+    assert snapshot_zone(zones[0]) == {
+        "name": "Downstairs",
+        "zone_index": 1,
+        "room_temperature": 20.5,
+        "target_temperature": 19.5,
+        "flow_temperature": 36.0,
+        "return_temperature": 30.0,
+        "target_flow_temperature": 25.0,
+        "operation_mode": ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
+        "operation_modes": _HEAT_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_HEAT,
+    }
+
+    assert snapshot_zone(zones[1]) == {
+        "name": "Upstairs",
+        "zone_index": 2,
+        "room_temperature": 19.5,
+        "target_temperature": 18,
+        "flow_temperature": 36.0,
+        "return_temperature": 30.0,
+        "target_flow_temperature": 25.0,
+        "operation_mode": ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
+        "operation_modes": _HEAT_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_HEAT,
+    }
 
 
 @pytest.mark.asyncio
@@ -202,10 +212,7 @@ async def test_2zone_cancool():
     assert device.temperature_increment == 0.5
 
     assert device.operation_mode is None
-    assert device.operation_modes == [
-        OPERATION_MODE_AUTO,
-        OPERATION_MODE_FORCE_HOT_WATER,
-    ]
+    assert device.operation_modes == _OPERATION_MODES
     assert device.tank_temperature is None
     assert device.status is STATUS_UNKNOWN
     assert device.target_tank_temperature is None
@@ -222,39 +229,31 @@ async def test_2zone_cancool():
     zones = device.zones
 
     assert len(zones) == 2
-    assert zones[0].name == "Zone 1"
-    assert zones[0].zone_index == 1
-    assert zones[0].room_temperature is None
-    assert zones[0].target_temperature is None
-    assert zones[0].flow_temperature == 50.5
-    assert zones[0].return_temperature == 50.5
-    assert zones[0].target_flow_temperature is None
-    assert zones[0].operation_mode is None
-    assert zones[0].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-        ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-        ZONE_OPERATION_MODE_COOL_FLOW,
-    ]
-    assert zones[0].status == ZONE_STATUS_UNKNOWN
-
-    assert zones[1].name == "Zone 2"
-    assert zones[1].zone_index == 2
-    assert zones[1].room_temperature is None
-    assert zones[1].target_temperature is None
-    assert zones[1].flow_temperature == 50.5
-    assert zones[1].return_temperature == 50.5
-    assert zones[1].target_flow_temperature is None
-    assert zones[1].operation_mode is None
-    assert zones[1].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-        ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-        ZONE_OPERATION_MODE_COOL_FLOW,
-    ]
-    assert zones[1].status == ZONE_STATUS_UNKNOWN
+    assert snapshot_zone(zones[0]) == {
+        "name": "Zone 1",
+        "zone_index": 1,
+        "room_temperature": None,
+        "target_temperature": None,
+        "flow_temperature": 50.5,
+        "return_temperature": 50.5,
+        "target_flow_temperature": None,
+        "operation_mode": None,
+        "operation_modes": _COOL_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_UNKNOWN,
+    }
+
+    assert snapshot_zone(zones[1]) == {
+        "name": "Zone 2",
+        "zone_index": 2,
+        "room_temperature": None,
+        "target_temperature": None,
+        "flow_temperature": 50.5,
+        "return_temperature": 50.5,
+        "target_flow_temperature": None,
+        "operation_mode": None,
+        "operation_modes": _COOL_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_UNKNOWN,
+    }
 
     await device.update()
 
@@ -270,28 +269,88 @@ async def test_2zone_cancool():
     assert device.has_error is False
     assert device.error_code == 8000
 
-    assert zones[0].room_temperature == 21.5
-    assert zones[0].target_temperature == 20.5
-    assert zones[0].target_flow_temperature == 5.0
-    assert zones[0].operation_mode == ZONE_OPERATION_MODE_CURVE
-    assert zones[0].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-        ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-        ZONE_OPERATION_MODE_COOL_FLOW,
-    ]
-    assert zones[0].status == ZONE_STATUS_IDLE
-
-    assert zones[1].room_temperature == 21.0
-    assert zones[1].target_temperature == 21.0
-    assert zones[1].target_flow_temperature == 5.0
-    assert zones[1].operation_mode == ZONE_OPERATION_MODE_CURVE
-    assert zones[1].operation_modes == [
-        ZONE_OPERATION_MODE_HEAT_THERMOSTAT,
-        ZONE_OPERATION_MODE_HEAT_FLOW,
-        ZONE_OPERATION_MODE_CURVE,
-        ZONE_OPERATION_MODE_COOL_THERMOSTAT,
-        ZONE_OPERATION_MODE_COOL_FLOW,
-    ]
-    assert zones[1].status == ZONE_STATUS_IDLE
+    assert snapshot_zone(zones[0]) == {
+        "name": "Zone 1",
+        "zone_index": 1,
+        "room_temperature": 21.5,
+        "target_temperature": 20.5,
+        "flow_temperature": 50.5,
+        "return_temperature": 50.5,
+        "target_flow_temperature": 5.0,
+        "operation_mode": ZONE_OPERATION_MODE_CURVE,
+        "operation_modes": _COOL_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_IDLE,
+    }
+
+    assert snapshot_zone(zones[1]) == {
+        "name": "Zone 2",
+        "zone_index": 2,
+        "room_temperature": 21.0,
+        "target_temperature": 21.0,
+        "flow_temperature": 50.5,
+        "return_temperature": 50.5,
+        "target_flow_temperature": 5.0,
+        "operation_mode": ZONE_OPERATION_MODE_CURVE,
+        "operation_modes": _COOL_ZONE_OPERATION_MODES,
+        "status": ZONE_STATUS_IDLE,
+    }
+
+
+def test_apply_write():
+    device = _build_device(
+        "atw_2zone_listdevice.json", "atw_2zone_get.json", load_state=False
+    )
+
+    state = {}
+    device.apply_write(state, "zone_1_target_temperature", 20.2)
+    device.apply_write(state, "operation_mode", OPERATION_MODE_FORCE_HOT_WATER)
+
+    assert state == {
+        "SetTemperatureZone1": 20.0,
+        "ForcedHotWaterMode": True,
+        "EffectiveFlags": 0x200010080,
+    }
+
+    with pytest.raises(ValueError):
+        device.apply_write(state, "invalid", 1)
+
+
+def test_zones_are_reused():
+    device = _build_device(
+        "atw_2zone_listdevice.json", "atw_2zone_get.json", load_state=False
+    )
+
+    zones = device.zones
+
+    assert [zone.zone_index for zone in zones] == [1, 2]
+    assert all(a is b for a, b in zip(zones, device.zones))
+
+
+@pytest.mark.asyncio
+async def test_zone_operation_modes_follow_conf():
+    device = _build_device("atw_2zone_listdevice.json", "atw_2zone_get.json")
+    zone = device.zones[0]
+
+    assert zone.operation_modes == _HEAT_ZONE_OPERATION_MODES
+
+    conf = device._client.get_device_conf.return_value
+    conf = {**conf, "Device": {**conf["Device"], "CanCool": True}}
+    device._client.get_device_conf.return_value = conf
+    await device.update()
+
+    assert zone.operation_modes == _COOL_ZONE_OPERATION_MODES
+
+
+@pytest.mark.asyncio
+async def test_zone_operation_mode_rejects_non_int():
+    device = _build_device("atw_2zone_listdevice.json", "atw_2zone_get.json")
+    await device.update()
+    zone = device.zones[0]
+
+    device._state["OperationModeZone1"] = 99
+    assert zone.operation_mode == ZONE_OPERATION_MODE_UNKNOWN
+
+    for mode in [1.0, "1", None]:
+        device._state["OperationModeZone1"] = mode
+        with pytest.raises(ValueError):
+            zone.operation_mode
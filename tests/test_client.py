@@ -0,0 +1,137 @@
+"""Client tests."""
+import asyncio
+import json
+
+import pytest
+from asynctest import CoroutineMock, MagicMock, Mock, patch
+from pymelcloud.client import Client, login
+
+
+@pytest.mark.asyncio
+@patch.object(Client, "_fetch_user_details", new_callable=CoroutineMock)
+@patch.object(Client, "_fetch_device_confs", new_callable=CoroutineMock)
+async def test_update_confs_rate_limit(fetch_device_confs, fetch_user_details):
+    client = Client("token", Mock())
+
+    await asyncio.gather(client.update_confs(), client.update_confs())
+    await client.update_confs()
+
+    fetch_device_confs.assert_called_once()
+    fetch_user_details.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_context_closes_managed_session():
+    async with Client("token") as client:
+        session = client._session
+
+    assert session.closed
+
+
+@pytest.mark.asyncio
+async def test_context_keeps_provided_session():
+    session = Mock(closed=False, close=CoroutineMock())
+
+    async with Client("token", session):
+        pass
+
+    session.close.assert_not_called()
+
+
+@pytest.mark.asyncio
+async def test_fetch_device_state_cache():
+    session = MagicMock()
+    resp = session.get.return_value.__aenter__.return_value
+    resp.read = CoroutineMock(return_value=b'{"DeviceID": 1}')
+    client = Client("token", session)
+    device = Mock(device_id=1, building_id=2)
+
+    assert await client.fetch_device_state(device) == {"DeviceID": 1}
+    assert await client.fetch_device_state(device) == {"DeviceID": 1}
+    assert session.get.call_count == 1
+
+    await client.fetch_device_state(device, force=True)
+    assert session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_set_device_state_invalidates_state_cache():
+    session = MagicMock()
+    resp = session.get.return_value.__aenter__.return_value
+    resp.read = CoroutineMock(return_value=b'{"DeviceID": 1}')
+    post_resp = session.post.return_value.__aenter__.return_value
+    post_resp.read = CoroutineMock(return_value=b'{"DeviceID": 1}')
+    client = Client("token", session)
+    device = Mock(device_id=1, building_id=2)
+
+    state = await client.fetch_device_state(device)
+    state["Power"] = True
+    assert await client.fetch_device_state(device) == {"DeviceID": 1}
+    assert session.get.call_count == 1
+
+    await client.set_device_state({"DeviceID": 1, "DeviceType": 0})
+    await client.fetch_device_state(device)
+    assert session.get.call_count == 2
+
+
+@pytest.mark.asyncio
+async def test_fetch_device_confs():
+    def _device(device_id, building_id=10):
+        return {"DeviceID": device_id, "BuildingID": building_id}
+
+    entries = [
+        {
+            "Structure": {
+                "Devices": [_device(1)],
+                "Areas": [{"Devices": [_device(2)]}],
+                "Floors": [
+                    {
+                        "Devices": [_device(3), _device(1, 20)],
+                        "Areas": [{"Devices": [_device(4)]}],
+                    }
+                ],
+            }
+        }
+    ]
+    session = MagicMock()
+    resp = session.get.return_value.__aenter__.return_value
+    resp.read = CoroutineMock(return_value=json.dumps(entries).encode())
+    client = Client("token", session)
+
+    await client._fetch_device_confs()
+
+    assert client.device_confs == [_device(1), _device(2), _device(3), _device(4)]
+    assert client.get_device_conf(1, 10) == _device(1)
+    assert client.get_device_conf(4, 10) == _device(4)
+    with pytest.raises(KeyError):
+        client.get_device_conf(1, 20)
+
+
+@pytest.mark.asyncio
+async def test_login_hands_over_session():
+    session = MagicMock(closed=False, close=CoroutineMock())
+    resp = session.post.return_value.__aenter__.return_value
+    resp.read = CoroutineMock(return_value=b'{"LoginData": {"ContextKey": "key"}}')
+
+    with patch("pymelcloud.client._new_session", return_value=session):
+        client = await login("email", "password")
+
+    assert client.token == "key"
+    assert client._session is session
+    session.close.assert_not_called()
+
+    await client.close()
+    session.close.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_login_closes_session_on_failed_login():
+    session = MagicMock(closed=False, close=CoroutineMock())
+    resp = session.post.return_value.__aenter__.return_value
+    resp.read = CoroutineMock(return_value=b'{"ErrorId": 1, "LoginData": null}')
+
+    with patch("pymelcloud.client._new_session", return_value=session):
+        with pytest.raises(AttributeError):
+            await login("email", "password")
+
+    session.close.assert_called_once()
@@ -1,44 +1,61 @@
 """Device tests."""
+import asyncio
+from datetime import datetime
 from typing import Any, Dict, Optional
 
 import pytest
+from asynctest import CoroutineMock
+from pymelcloud import update_devices
 from pymelcloud.ata_device import AtaDevice
+from pymelcloud.device import _parse_timestamp
 from .util import build_device
 
 
-def _build_device(device_conf_name: str, device_state_name: str, energy_report: Optional[Dict[Any, Any]]=None) -> AtaDevice:
-    device_conf, client = build_device(device_conf_name, device_state_name, energy_report)
+def _build_device(
+    device_conf_name: str,
+    device_state_name: str,
+    energy_report: Optional[Dict[Any, Any]] = None,
+    load_state: bool = True,
+) -> AtaDevice:
+    device_conf, client = build_device(
+        device_conf_name, device_state_name, energy_report, load_state
+    )
     return AtaDevice(device_conf, client)
 
 
-@pytest.mark.asyncio
-async def test_round_temperature():
-    device = _build_device("ata_listdevice.json", "ata_get.json")
-    device._device_conf.get("Device")["TemperatureIncrement"] = 0.5
-
-    assert device.round_temperature(23.99999) == 24.0
-    assert device.round_temperature(24.0) == 24.0
-    assert device.round_temperature(24.00001) == 24.0
-    assert device.round_temperature(24.24999) == 24.0
-    assert device.round_temperature(24.25) == 24.5
-    assert device.round_temperature(24.25001) == 24.5
-    assert device.round_temperature(24.5) == 24.5
-    assert device.round_temperature(24.74999) == 24.5
-    assert device.round_temperature(24.75) == 25.0
-    assert device.round_temperature(24.75001) == 25.0
-
-    device._device_conf.get("Device")["TemperatureIncrement"] = 1
-
-    assert device.round_temperature(23.99999) == 24.0
-    assert device.round_temperature(24.0) == 24.0
-    assert device.round_temperature(24.00001) == 24.0
-    assert device.round_temperature(24.49999) == 24.0
-    assert device.round_temperature(24.5) == 25.0
-    assert device.round_temperature(24.50001) == 25.0
-    assert device.round_temperature(25.0) == 25.0
-    assert device.round_temperature(25.00001) == 25.0
-    assert device.round_temperature(25.49999) == 25.0
-    assert device.round_temperature(25.5) == 26.0
+@pytest.mark.parametrize(
+    "increment,value,expected",
+    [
+        (0.5, 23.99999, 24.0),
+        (0.5, 24.0, 24.0),
+        (0.5, 24.00001, 24.0),
+        (0.5, 24.24999, 24.0),
+        (0.5, 24.25, 24.5),
+        (0.5, 24.25001, 24.5),
+        (0.5, 24.5, 24.5),
+        (0.5, 24.74999, 24.5),
+        (0.5, 24.75, 25.0),
+        (0.5, 24.75001, 25.0),
+        (1, 23.99999, 24.0),
+        (1, 24.0, 24.0),
+        (1, 24.00001, 24.0),
+        (1, 24.49999, 24.0),
+        (1, 24.5, 25.0),
+        (1, 24.50001, 25.0),
+        (1, 25.0, 25.0),
+        (1, 25.00001, 25.0),
+        (1, 25.49999, 25.0),
+        (1, 25.5, 26.0),
+        (1, -0.5, -1.0),
+        (1, -0.49999, 0.0),
+    ],
+)
+def test_round_temperature(increment, value, expected):
+    device = _build_device("ata_listdevice.json", "ata_get.json", load_state=False)
+    device._device_conf.get("Device")["TemperatureIncrement"] = increment
+
+    assert device.round_temperature(value) == expected
+
 
 @pytest.mark.asyncio
 async def test_energy_report_none_if_no_report():
@@ -49,12 +66,12 @@ async def test_energy_report_none_if_no_report():
     assert device.daily_energy_consumed is None
 
 def test_energy_report_before_update():
-    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device = _build_device("ata_listdevice.json", "ata_get.json", load_state=False)
 
     assert device.daily_energy_consumed is None
 
 @pytest.mark.asyncio
-async def test_round_temperature():
+async def test_daily_energy_consumed():
     device = _build_device(
         "ata_listdevice.json",
         "ata_get.json",
@@ -69,3 +86,165 @@ async def test_round_temperature():
     await device.update()
 
     assert device.daily_energy_consumed == 1111.0
+
+
+@pytest.mark.asyncio
+async def test_set_coalesces_writes():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._set_debounce_seconds = 0.01
+
+    await device.update()
+    device._client.set_device_state = CoroutineMock(side_effect=lambda state: state)
+
+    await asyncio.gather(
+        device.set({"target_temperature": 23.0}),
+        device.set({"fan_speed": "2"}),
+    )
+
+    device._client.set_device_state.assert_called_once()
+    assert device.target_temperature == 23.0
+    assert device.fan_speed == "2"
+
+
+@pytest.mark.asyncio
+async def test_set_before_update_fetches_state():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._set_debounce_seconds = 0.01
+    device._client.set_device_state = CoroutineMock(side_effect=lambda state: state)
+
+    await device.set({"target_temperature": 23.0})
+
+    device._client.fetch_device_state.assert_called_once_with(device, force=True)
+    assert device.target_temperature == 23.0
+
+
+@pytest.mark.asyncio
+async def test_set_skips_empty_write():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._set_debounce_seconds = 0.01
+
+    await device.update()
+    device._client.set_device_state = CoroutineMock(side_effect=lambda state: state)
+
+    await device.set({})
+
+    device._client.set_device_state.assert_not_called()
+    assert device._write_handle is None
+    assert device._write_task is None
+
+
+@pytest.mark.asyncio
+async def test_set_writes_values_matching_fetched_state():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._set_debounce_seconds = 0.01
+
+    await device.update()
+    device._client.set_device_state = CoroutineMock(side_effect=lambda state: state)
+
+    await device.set({"power": device.power})
+
+    device._client.set_device_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_set_raises_write_error():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._set_debounce_seconds = 0.01
+
+    await device.update()
+    device._client.set_device_state = CoroutineMock(side_effect=RuntimeError)
+
+    with pytest.raises(RuntimeError):
+        await asyncio.gather(
+            device.set({"target_temperature": 23.0}),
+            device.set({"fan_speed": "2"}),
+        )
+
+
+@pytest.mark.asyncio
+async def test_set_flushes_writes_queued_during_failed_write():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._set_debounce_seconds = 0.01
+
+    await device.update()
+
+    calls = []
+    started = asyncio.Event()
+    release = asyncio.Event()
+
+    async def set_device_state(state):
+        calls.append(state)
+        if len(calls) == 1:
+            started.set()
+            await release.wait()
+            raise RuntimeError("boom")
+        return state
+
+    device._client.set_device_state = set_device_state
+
+    first = asyncio.ensure_future(device.set({"target_temperature": 23.0}))
+    await started.wait()
+    second = asyncio.ensure_future(device.set({"fan_speed": "2"}))
+    await asyncio.sleep(0.05)
+    release.set()
+
+    with pytest.raises(RuntimeError):
+        await first
+    await second
+
+    assert len(calls) == 2
+    assert calls[1]["SetFanSpeed"] == 2
+    assert device.fan_speed == "2"
+
+
+def test_parse_timestamp():
+    assert _parse_timestamp("2020-07-03T09:03:50.32") == datetime(
+        2020, 7, 3, 9, 3, 50, 320000
+    )
+    assert _parse_timestamp("2020-07-03T09:03:50.123456") == datetime(
+        2020, 7, 3, 9, 3, 50, 123456
+    )
+    assert _parse_timestamp("2020-07-03T09:03:50") == datetime(2020, 7, 3, 9, 3, 50)
+
+    for value in [
+        "invalid",
+        "2020-07-03T09:03:50.",
+        "2020-07-03T09:03:50Z",
+        "2020-07-03T09:03:50+02:00",
+        "2020-07-03T09:03:50.32+02:00",
+        "2020-07-03 09:03:50.32",
+    ]:
+        with pytest.raises(ValueError):
+            _parse_timestamp(value)
+
+
+@pytest.mark.asyncio
+async def test_update_devices():
+    devices = [
+        _build_device("ata_listdevice.json", "ata_get.json") for _ in range(2)
+    ]
+
+    await update_devices(devices)
+
+    for device in devices:
+        assert device.power is not None
+        device._client.fetch_device_state.assert_called_once()
+
+
+@pytest.mark.asyncio
+async def test_units():
+    device = _build_device("ata_listdevice.json", "ata_get.json")
+    device._client.fetch_device_units = CoroutineMock(
+        return_value=[{"ModelNumber": 1, "Model": "MUZ", "SerialNumber": "123"}]
+    )
+
+    assert device.units is None
+
+    await device.update()
+
+    assert device.units == [
+        {"model_number": 1, "model": "MUZ", "serial_number": "123"}
+    ]
+
+    device.units[0]["model"] = "changed"
+    assert device.units[0]["model"] == "MUZ"
@@ -1,9 +1,5 @@
 """ERV tests."""
-import json
-import os
-
 import pytest
-from asynctest import CoroutineMock, Mock, patch
 from pymelcloud import DEVICE_TYPE_ERV
 from pymelcloud.erv_device import (
     VENTILATION_MODE_AUTO,
@@ -11,24 +7,15 @@ from pymelcloud.erv_device import (
     VENTILATION_MODE_RECOVERY,
     ErvDevice,
 )
+from .util import build_device
 
 
-def _build_device(device_conf_name: str, device_state_name: str) -> ErvDevice:
-    test_dir = os.path.join(os.path.dirname(__file__), "samples")
-    with open(os.path.join(test_dir, device_conf_name), "r") as json_file:
-        device_conf = json.load(json_file)
-
-    with open(os.path.join(test_dir, device_state_name), "r") as json_file:
-        device_state = json.load(json_file)
-
-    with patch("pymelcloud.client.Client") as _client:
-        _client.update_confs = CoroutineMock()
-        _client.device_confs.__iter__ = Mock(return_value=[device_conf].__iter__())
-        _client.fetch_device_units = CoroutineMock(return_value=[])
-        _client.fetch_device_state = CoroutineMock(return_value=device_state)
-        _client.fetch_energy_report = CoroutineMock(return_value=None)
-        client = _client
-
+def _build_device(
+    device_conf_name: str, device_state_name: str, load_state: bool = True
+) -> ErvDevice:
+    device_conf, client = build_device(
+        device_conf_name, device_state_name, load_state=load_state
+    )
     return ErvDevice(device_conf, client)
 
 @pytest.mark.asyncio
@@ -79,3 +66,28 @@ async def test_erv():
     assert device.has_error is False
     assert device.error_code == 8000
     assert str(device.last_seen) == '2020-07-07 06:44:11.027000+00:00'
+
+
+def test_erv_apply_write():
+    device = _build_device("erv_listdevice.json", "erv_get.json", load_state=False)
+
+    state = {}
+    device.apply_write(state, "ventilation_mode", VENTILATION_MODE_BYPASS)
+    assert state == {"VentilationMode": 1, "EffectiveFlags": 0x04}
+
+    with pytest.raises(ValueError):
+        device.apply_write({}, "ventilation_mode", "invalid")
+
+    for speed, expected in [("0", 0), ("3", 3), ("20", 20)]:
+        state = {}
+        device.apply_write(state, "fan_speed", speed)
+        assert state == {"SetFanSpeed": expected, "EffectiveFlags": 0x08}
+
+
+@pytest.mark.asyncio
+async def test_erv_fan_speeds_negative_count():
+    device = _build_device("erv_listdevice.json", "erv_get.json")
+    await device.update()
+    device._state["NumberOfFanSpeeds"] = -1
+
+    assert device.fan_speeds == []
@@ -1,23 +1,66 @@
-import json
 import os
+from functools import lru_cache
 from typing import Any, Dict, Optional
 
-from asynctest import CoroutineMock, Mock, patch
+import orjson
+from asynctest import CoroutineMock, MagicMock, Mock
 
-def build_device(device_conf_name: str, device_state_name: str, energy_report: Optional[Dict[Any, Any]]=None):
-    test_dir = os.path.join(os.path.dirname(__file__), "samples")
-    with open(os.path.join(test_dir, device_conf_name), "r") as json_file:
-        device_conf = json.load(json_file)
+_SAMPLES_DIR = os.path.join(os.path.dirname(__file__), "samples")
 
-    with open(os.path.join(test_dir, device_state_name), "r") as json_file:
-        device_state = json.load(json_file)
 
-    with patch("pymelcloud.client.Client") as _client:
-        _client.update_confs = CoroutineMock()
-        _client.device_confs.__iter__ = Mock(return_value=[device_conf].__iter__())
-        _client.fetch_device_units = CoroutineMock(return_value=[])
-        _client.fetch_device_state = CoroutineMock(return_value=device_state)
-        _client.fetch_energy_report = CoroutineMock(return_value=energy_report)
-        client = _client
+@lru_cache(maxsize=None)
+def _read_sample(name: str) -> bytes:
+    with open(os.path.join(_SAMPLES_DIR, name), "rb") as json_file:
+        return json_file.read()
+
+
+def load_sample(name: str) -> Any:
+    """Parse a sample file. Every call returns a fresh object."""
+    return orjson.loads(_read_sample(name))
+
+
+def build_device(
+    device_conf_name: str,
+    device_state_name: str,
+    energy_report: Optional[Dict[Any, Any]]=None,
+    load_state: bool=True,
+):
+    """Build a device conf and a mocked client serving the given samples.
+
+    With load_state=False the state sample is not parsed and an update() of the
+    device fails the test.
+    """
+    device_conf = load_sample(device_conf_name)
+
+    client = MagicMock()
+    client.update_confs = CoroutineMock()
+    client.device_confs = [device_conf]
+    client.get_device_conf = Mock(return_value=device_conf)
+    client.fetch_device_units = CoroutineMock(return_value=[])
+    if load_state:
+        client.fetch_device_state = CoroutineMock(
+            return_value=load_sample(device_state_name)
+        )
+    else:
+        client.fetch_device_state = CoroutineMock(
+            side_effect=AssertionError("update() unexpectedly called")
+        )
+    client.fetch_energy_report = CoroutineMock(return_value=energy_report)
 
     return device_conf, client
+
+
+def snapshot_zone(zone) -> Dict[str, Any]:
+    """Collect the public state of an ATW zone for a single comparison."""
+    return {
+        "name": zone.name,
+        "zone_index": zone.zone_index,
+        "room_temperature": zone.room_temperature,
+        "target_temperature": zone.target_temperature,
+        "flow_temperature": zone.flow_temperature,
+        "return_temperature": zone.return_temperature,
+        "target_flow_temperature": zone.target_flow_temperature,
+        "operation_mode": zone.operation_mode,
+        "operation_modes": zone.operation_modes,
+        "status": zone.status,
+    }